@@ -1,76 +1,399 @@
 """
 Agent classes for the Brazilian Migration to Portugal ABM.
 Defines Locals (Portuguese natives) and Migrants (Brazilian immigrants).
+
+Agents are stored as a Struct-of-Arrays in a `Population` container: one
+NumPy column per attribute, indexed by the agent's slot. `PersonAgent`,
+`LocalAgent` and `MigrantAgent` are thin views over a single slot that keep
+the original object-oriented API available.
 """
 
-import random
-from enum import Enum
+import numpy as np
 
+from kernels import (HAVE_NUMBA, counter_uniform, direction_rates, interact_batch,
+                     interact_batch_numpy, step_kernel, step_numpy)
 
-class Sex(Enum):
-    """Biological sex of agents."""
-    MALE = "male"
-    FEMALE = "female"
 
+# Biological sex codes stored in `Population.sex`
+MALE, FEMALE = 0, 1
 
-class PersonAgent:
-    """Base class for all person agents in the simulation."""
+# Column order of the linguistic features in `Population.features`
+VOCAB, GRAMMAR, PHONETICS, PRONOUNS = range(4)
+
+# Storage type of the linguistic features. Monthly media effects can be as
+# small as ~0.001 percentage points, below the step of any 8- or 16-bit
+# fixed-point encoding of 0-100 and of float16 (whose spacing is 1/16 between
+# 64 and 128), so such updates would round away and features stay in float32.
+FEATURE_DTYPE = np.float32
+
+# Initial feature ranges (low, high) per column
+_LOCAL_FEATURE_RANGE = ([5, 2, 1, 8], [10, 5, 3, 15])
+_MIGRANT_FEATURE_RANGE = ([95, 90, 85, 80], [100, 100, 100, 100])
+
+# Media effect per feature: strongest on vocabulary, weakest on phonetics
+_MEDIA_WEIGHTS = np.array([0.05, 0.03, 0.01, 0.02], dtype=FEATURE_DTYPE)
+
+
+class Population:
+    """Struct-of-Arrays storage for every person agent in the simulation."""
+    
+    # (column name, dtype, per-agent shape) for every per-agent attribute
+    COLUMNS = (
+        ("agent_id", np.int32, ()),
+        ("age", np.int16, ()),
+        ("sex", np.uint8, ()),
+        ("district_id", np.int16, ()),
+        ("district_pos", np.int32, ()),  # position in the district's member array, -1 if none
+        ("features", FEATURE_DTYPE, (4,)),  # vocab, grammar, phonetics, pronouns (0-100)
+        ("media_exposure", np.float32, ()),
+        ("interaction_frequency", np.float32, ()),
+        ("educated", np.bool_, ()),
+        ("reveal_identity", np.bool_, ()),
+        ("is_migrant", np.bool_, ()),
+        ("arrival_age", np.int16, ()),  # age on arrival in Portugal, 0 if born here
+        ("alive", np.bool_, ()),
+    )
     
-    def __init__(self, agent_id, age, sex, district_id, model):
+    def __init__(self, model, capacity=1024):
         """
-        Initialize a person agent.
+        Initialize an empty population.
         
         Args:
-            agent_id: Unique identifier for the agent
-            age: Age in years
-            sex: Sex (male/female)
-            district_id: ID of the district where agent lives
             model: Reference to the main model
+            capacity: Initial number of agent slots to allocate
         """
-        self.agent_id = agent_id
-        self.age = age
-        self.sex = sex
-        self.district_id = district_id
         self.model = model
+        self.rng = model.rng
+        self.n = 0
+        self.capacity = 0
+        for name, dtype, shape in self.COLUMNS:
+            setattr(self, name, np.zeros((0,) + shape, dtype=dtype))
+        self._grow(capacity)
+    
+    def __len__(self):
+        return self.n
+    
+    @property
+    def vocab(self):
+        return self.features[:, VOCAB]
+    
+    @property
+    def grammar(self):
+        return self.features[:, GRAMMAR]
+    
+    @property
+    def phonetics(self):
+        return self.features[:, PHONETICS]
+    
+    @property
+    def pronouns(self):
+        return self.features[:, PRONOUNS]
+    
+    def _grow(self, capacity):
+        """Resize every column to hold at least `capacity` agents."""
+        for name, dtype, shape in self.COLUMNS:
+            column = np.zeros((capacity,) + shape, dtype=dtype)
+            column[:self.n] = getattr(self, name)[:self.n]
+            setattr(self, name, column)
+        self.capacity = capacity
+    
+    def _reserve(self, n):
+        """
+        Reserve `n` new agent slots at the end of the arrays.
+        
+        Returns:
+            Slice covering the reserved slots
+        """
+        if self.n + n > self.capacity:
+            self._grow(max(self.n + n, 2 * self.capacity))
+        start = self.n
+        self.n += n
+        self.agent_id[start:self.n] = np.arange(self.model.next_agent_id,
+                                                self.model.next_agent_id + n)
+        self.model.next_agent_id += n
+        return slice(start, self.n)
+    
+    def _spawn(self, ages, sexes, district_ids, is_migrant):
+        """Fill the attributes shared by locals and migrants for a batch of new agents."""
+        n = len(ages)
+        s = self._reserve(n)
+        
+        # One vectorized draw per attribute for the whole batch
+        self.age[s] = ages
+        self.sex[s] = sexes
+        self.district_id[s] = district_ids
+        self.district_pos[s] = -1
+        self.media_exposure[s] = self.rng.uniform(30, 80, n)
+        self.interaction_frequency[s] = self.rng.uniform(0.5, 1.0, n)
+        self.educated[s] = self.rng.random(n) < 0.5  # 50% educated by default
+        self.is_migrant[s] = is_migrant
+        self.alive[s] = True
+        return s
+    
+    def spawn_locals(self, ages, sexes, district_ids):
+        """
+        Create a batch of native Portuguese agents.
+        
+        Args:
+            ages: Sequence of ages in years
+            sexes: Sequence of sex codes (MALE or FEMALE)
+            district_ids: Sequence of district IDs
+        
+        Returns:
+            Slice of the new agents' slots
+        """
+        s = self._spawn(ages, sexes, district_ids, is_migrant=False)
+        n = s.stop - s.start
+        
+        # Locals start with low Brazilian Portuguese features
+        # (vocab 5-10%, grammar 2-5%, phonetics 1-3%, pronouns 8-15%)
+        self.features[s] = self.rng.uniform(*_LOCAL_FEATURE_RANGE, size=(n, 4))
+        
+        # Born here, so years in Portugal = age
+        self.arrival_age[s] = 0
+        
+        # Reveal identity based on model parameter
+        self.reveal_identity[s] = self.rng.random(n) < self.model.params["reveal_share_locals"]
+        return s
+    
+    def spawn_migrants(self, ages, sexes, district_ids):
+        """
+        Create a batch of Brazilian immigrant agents.
+        
+        Args:
+            ages: Sequence of ages in years
+            sexes: Sequence of sex codes (MALE or FEMALE)
+            district_ids: Sequence of district IDs
+        
+        Returns:
+            Slice of the new agents' slots
+        """
+        s = self._spawn(ages, sexes, district_ids, is_migrant=True)
+        n = s.stop - s.start
+        
+        # Migrants start with high Brazilian Portuguese features
+        # (vocab 95-100%, grammar 90-100%, phonetics 85-100%, pronouns 80-100%)
+        self.features[s] = self.rng.uniform(*_MIGRANT_FEATURE_RANGE, size=(n, 4))
+        
+        # Just arrived
+        self.arrival_age[s] = self.age[s]
+        
+        # Reveal identity based on model parameter
+        self.reveal_identity[s] = self.rng.random(n) < self.model.params["reveal_share_migrants"]
+        return s
+    
+    def inherit_features(self, children, parents, variation=5):
+        """
+        Copy the parents' linguistic features to their children (mother tongue effect).
+        
+        Args:
+            children: Population slots of the children
+            parents: Population slots of their parents, one per child
+            variation: Maximum deviation from the parent's value of each feature
+        """
+        inherited = self.features[parents] + self.rng.uniform(-variation, variation, (len(parents), 4))
+        self.features[children] = np.clip(inherited, 0, 100)
+    
+    def apply_media_influence_bulk(self, indices, district_media_infrastructure, base_media_influence):
+        """
+        Apply media exposure effects to a batch of local agents in one district.
+        
+        Args:
+            indices: Population slots of the local agents to update
+            district_media_infrastructure: Media infrastructure level in district (0-100)
+            base_media_influence: Global media influence parameter
+        """
+        # Media influence is strongest on vocabulary, weaker on other features
+        scale = np.float32(district_media_infrastructure / 10000.0 * base_media_influence)
+        total_media = self.media_exposure[indices] * scale
+        
+        # Apply differential effects to all four features in one expression
+        updated = np.multiply(total_media[:, None], _MEDIA_WEIGHTS)
+        updated += self.features[indices]
+        self.features[indices] = np.clip(updated, 0, 100, out=updated)
+    
+    def interact(self, i_idx, j_idx, table):
+        """
+        Apply a batch of pairwise linguistic interactions.
+        
+        Args:
+            i_idx: Population slots of the agents starting each interaction
+            j_idx: Population slots of their partners
+            table: Direction table of influence rates, see `kernels.direction_rates`
+        """
+        i_idx = np.asarray(i_idx, dtype=np.int32)
+        j_idx = np.asarray(j_idx, dtype=np.int32)
+        columns = (self.features, self.is_migrant, self.reveal_identity, self.interaction_frequency, table)
+        if not HAVE_NUMBA:
+            # One NumPy gather/scatter instead of an interpreted pair-by-pair loop
+            interact_batch_numpy(i_idx, j_idx, *columns)
+            return
+        
+        # Pairs within one district touch only that district's agents, so districts
+        # run in parallel; pairs across districts fall back to a single ordered group
+        district = self.district_id[i_idx]
+        if np.array_equal(district, self.district_id[j_idx]):
+            order = np.argsort(district, kind="stable")
+            i_idx, j_idx = i_idx[order], j_idx[order]
+            indptr = np.concatenate(([0], np.cumsum(np.bincount(district))))
+        else:
+            indptr = np.array([0, len(i_idx)])
+        interact_batch(indptr, i_idx, j_idx, *columns)
+    
+    def step_agents(self, media_scale, annual, step, seed, death_rate_lut):
+        """
+        Apply media influence and, on annual steps, aging and mortality in one pass.
         
-        # Linguistic features (0-100 scale)
-        self.brazilian_vocab = 0
-        self.brazilian_grammar = 0
-        self.brazilian_phonetics = 0
-        self.brazilian_pronouns = 0
+        Args:
+            media_scale: float32 media influence per unit of exposure, indexed by district ID
+            annual: Whether agents also age one year and face mortality
+            step: Current time step
+            seed: Non-negative integer seed of the run
+            death_rate_lut: Annual death rate indexed by age
+        
+        Returns:
+            Boolean mask over the occupied slots of the agents that die
+        """
+        n = self.n
+        if annual:
+            draws = counter_uniform(self.agent_id[:n], step, seed)
+        else:
+            draws = np.zeros(0)
+        # Without Numba the fused kernel would be an interpreted per-agent loop
+        kernel = step_kernel if HAVE_NUMBA else step_numpy
+        return kernel(self.features[:n], self.media_exposure[:n], self.age[:n], self.alive[:n],
+                      self.is_migrant[:n], self.district_id[:n], media_scale, _MEDIA_WEIGHTS,
+                      annual, draws, death_rate_lut)
+    
+    def reorder(self, order):
+        """
+        Permute every column so that slot k holds the agent previously at `order[k]`.
         
-        # Social factors
-        self.reveal_identity = False
-        self.media_exposure = random.uniform(30, 80)
-        self.interaction_frequency = random.uniform(0.5, 1.0)
-        self.educated = random.random() < 0.5  # 50% educated by default
+        Slots not listed in `order` are dropped, and slot indices held
+        elsewhere (including agent views) are invalidated.
         
-        # Years in Portugal
-        self.years_in_portugal = 0
+        Args:
+            order: Array of current slots in their new order
+        """
+        n = len(order)
+        for name, _, _ in self.COLUMNS:
+            column = getattr(self, name)
+            column[:n] = column[order]
+        self.alive[n:self.n] = False
+        self.n = n
+    
+    def sort_by_district(self):
+        """
+        Drop dead agents and store the living ones grouped by district.
         
-        # Track if agent is alive
-        self.alive = True
+        Returns:
+            Sorted district_id column of the remaining agents
+        """
+        alive = np.flatnonzero(self.alive[:self.n])
+        self.reorder(alive[np.argsort(self.district_id[alive], kind="stable")])
+        return self.district_id[:self.n]
+    
+    def age_one_year_batch(self):
+        """Increase the age of every living agent by one year."""
+        alive = self.alive[:self.n]
+        self.age[:self.n][alive] += 1
+    
+    def years_in_portugal(self, indices):
+        """Years the given agents have lived in Portugal."""
+        return self.age[indices] - self.arrival_age[indices]
+    
+    def agent(self, index):
+        """Return an object view of the agent stored at `index`."""
+        if self.is_migrant[index]:
+            return MigrantAgent(self, index)
+        return LocalAgent(self, index)
+    
+    def alive_indices(self, is_migrant=None):
+        """
+        Get the slots of all living agents.
+        
+        Args:
+            is_migrant: If given, only return migrants (True) or locals (False)
+        
+        Returns:
+            Array of agent slots
+        """
+        mask = self.alive[:self.n]
+        if is_migrant is not None:
+            mask = mask & (self.is_migrant[:self.n] == is_migrant)
+        return np.flatnonzero(mask)
+
+
+def _column_property(column):
+    """Expose a population column as a read/write attribute of an agent view."""
+    def getter(self):
+        return getattr(self.population, column)[self.index]
+    
+    def setter(self, value):
+        getattr(self.population, column)[self.index] = value
+    
+    return property(getter, setter)
+
+
+class PersonAgent:
+    """View of a single person agent stored in a `Population`."""
+    
+    __slots__ = ("population", "index")
+    
+    def __init__(self, population, index):
+        """
+        Initialize a person agent view.
+        
+        Args:
+            population: Population holding the agent's data
+            index: Slot of the agent in the population arrays
+        """
+        self.population = population
+        self.index = index
+    
+    def __eq__(self, other):
+        return (isinstance(other, PersonAgent) and other.population is self.population
+                and other.index == self.index)
+    
+    def __hash__(self):
+        return hash((id(self.population), self.index))
+    
+    agent_id = _column_property("agent_id")
+    age = _column_property("age")
+    sex = _column_property("sex")
+    district_id = _column_property("district_id")
+    brazilian_vocab = _column_property("vocab")
+    brazilian_grammar = _column_property("grammar")
+    brazilian_phonetics = _column_property("phonetics")
+    brazilian_pronouns = _column_property("pronouns")
+    media_exposure = _column_property("media_exposure")
+    interaction_frequency = _column_property("interaction_frequency")
+    educated = _column_property("educated")
+    reveal_identity = _column_property("reveal_identity")
+    alive = _column_property("alive")
+    
+    @property
+    def years_in_portugal(self):
+        return self.population.years_in_portugal(self.index)
+    
+    @property
+    def model(self):
+        return self.population.model
     
     def age_one_year(self):
         """Increase age by one year."""
         self.age += 1
-        self.years_in_portugal += 1
     
-    def check_mortality(self, death_rate_by_age):
+    def check_mortality(self, death_rate_lut):
         """
         Check if agent dies based on age-dependent mortality.
         
         Args:
-            death_rate_by_age: Dictionary mapping age ranges to death rates
+            death_rate_lut: Annual death rate indexed by age (older ages use the last entry)
         """
-        # Find appropriate death rate for this age
-        death_rate = 0.001  # Default very low rate
-        for age_range, rate in death_rate_by_age.items():
-            if age_range[0] <= self.age < age_range[1]:
-                death_rate = rate
-                break
+        death_rate = death_rate_lut[min(self.age, len(death_rate_lut) - 1)]
         
-        if random.random() < death_rate:
+        if self.population.rng.random() < death_rate:
             self.alive = False
             return True
         return False
@@ -83,52 +406,9 @@ class PersonAgent:
             other_agent: Another PersonAgent to interact with
             influence_rates: Dictionary of influence rates for each feature
         """
-        # Determine influence direction and strength
-        if isinstance(self, MigrantAgent) and self.reveal_identity:
-            # Revealing migrant influences local
-            if isinstance(other_agent, LocalAgent):
-                self._influence_features(other_agent, influence_rates, direction="migrant_to_local")
-        
-        if isinstance(other_agent, MigrantAgent) and other_agent.reveal_identity:
-            # Revealing migrant influences local
-            if isinstance(self, LocalAgent):
-                other_agent._influence_features(self, influence_rates, direction="migrant_to_local")
-        
-        # Locals have small reverse effect on migrants
-        if isinstance(self, LocalAgent) and isinstance(other_agent, MigrantAgent):
-            self._influence_features(other_agent, influence_rates, direction="local_to_migrant")
-    
-    def _influence_features(self, target_agent, influence_rates, direction):
-        """
-        Apply linguistic influence from one agent to another.
-        
-        Args:
-            target_agent: Agent being influenced
-            influence_rates: Dictionary of influence rates
-            direction: "migrant_to_local" or "local_to_migrant"
-        """
-        if direction == "migrant_to_local":
-            # Migrants influence locals to adopt Brazilian features
-            target_agent.brazilian_vocab = min(100, target_agent.brazilian_vocab + 
-                                              influence_rates["vocab"] * self.interaction_frequency)
-            target_agent.brazilian_grammar = min(100, target_agent.brazilian_grammar + 
-                                                 influence_rates["grammar"] * self.interaction_frequency)
-            target_agent.brazilian_phonetics = min(100, target_agent.brazilian_phonetics + 
-                                                   influence_rates["phonetics"] * self.interaction_frequency)
-            target_agent.brazilian_pronouns = min(100, target_agent.brazilian_pronouns + 
-                                                 influence_rates["pronouns"] * self.interaction_frequency)
-        
-        elif direction == "local_to_migrant":
-            # Locals have small reverse effect (reduce Brazilian features)
-            reverse_rate = 0.1  # Much weaker effect
-            target_agent.brazilian_vocab = max(0, target_agent.brazilian_vocab - 
-                                              influence_rates["vocab"] * reverse_rate * self.interaction_frequency)
-            target_agent.brazilian_grammar = max(0, target_agent.brazilian_grammar - 
-                                                 influence_rates["grammar"] * reverse_rate * self.interaction_frequency)
-            target_agent.brazilian_phonetics = max(0, target_agent.brazilian_phonetics - 
-                                                   influence_rates["phonetics"] * reverse_rate * self.interaction_frequency)
-            target_agent.brazilian_pronouns = max(0, target_agent.brazilian_pronouns - 
-                                                 influence_rates["pronouns"] * reverse_rate * self.interaction_frequency)
+        table = direction_rates([influence_rates["vocab"], influence_rates["grammar"],
+                                 influence_rates["phonetics"], influence_rates["pronouns"]])
+        self.population.interact([self.index], [other_agent.index], table)
     
     def apply_media_influence(self, base_media_influence, district_media_infrastructure):
         """
@@ -138,21 +418,10 @@ class PersonAgent:
             base_media_influence: Global media influence parameter
             district_media_infrastructure: Media infrastructure level in district (0-100)
         """
-        # Media influence is strongest on vocabulary, weaker on other features
-        total_media = (self.media_exposure / 100) * (district_media_infrastructure / 100) * base_media_influence
-        
-        # Apply differential effects
-        vocab_effect = total_media * 0.05  # Strongest
-        grammar_effect = total_media * 0.03
-        pronoun_effect = total_media * 0.02
-        phonetics_effect = total_media * 0.01  # Weakest
-        
-        if isinstance(self, LocalAgent):
+        if not self.population.is_migrant[self.index]:
             # Media increases Brazilian features for locals
-            self.brazilian_vocab = min(100, self.brazilian_vocab + vocab_effect)
-            self.brazilian_grammar = min(100, self.brazilian_grammar + grammar_effect)
-            self.brazilian_pronouns = min(100, self.brazilian_pronouns + pronoun_effect)
-            self.brazilian_phonetics = min(100, self.brazilian_phonetics + phonetics_effect)
+            self.population.apply_media_influence_bulk(
+                [self.index], district_media_infrastructure, base_media_influence)
     
     def inherit_features_from_parent(self, parent):
         """
@@ -162,46 +431,16 @@ class PersonAgent:
             parent: Parent agent to inherit from
         """
         # Children inherit with some variation
-        variation = 5
-        self.brazilian_vocab = max(0, min(100, parent.brazilian_vocab + random.uniform(-variation, variation)))
-        self.brazilian_grammar = max(0, min(100, parent.brazilian_grammar + random.uniform(-variation, variation)))
-        self.brazilian_phonetics = max(0, min(100, parent.brazilian_phonetics + random.uniform(-variation, variation)))
-        self.brazilian_pronouns = max(0, min(100, parent.brazilian_pronouns + random.uniform(-variation, variation)))
+        self.population.inherit_features([self.index], [parent.index])
 
 
 class LocalAgent(PersonAgent):
-    """Agent representing a native Portuguese person."""
+    """View of an agent representing a native Portuguese person."""
     
-    def __init__(self, agent_id, age, sex, district_id, model):
-        super().__init__(agent_id, age, sex, district_id, model)
-        
-        # Locals start with low Brazilian Portuguese features
-        self.brazilian_vocab = random.uniform(5, 10)  # 5-10%
-        self.brazilian_grammar = random.uniform(2, 5)  # 2-5%
-        self.brazilian_phonetics = random.uniform(1, 3)  # 1-3%
-        self.brazilian_pronouns = random.uniform(8, 15)  # 8-15%
-        
-        # Years in Portugal = age (born here)
-        self.years_in_portugal = age
-        
-        # Reveal identity based on model parameter
-        self.reveal_identity = random.random() < model.params["reveal_share_locals"]
+    __slots__ = ()
 
 
 class MigrantAgent(PersonAgent):
-    """Agent representing a Brazilian immigrant."""
+    """View of an agent representing a Brazilian immigrant."""
     
-    def __init__(self, agent_id, age, sex, district_id, model):
-        super().__init__(agent_id, age, sex, district_id, model)
-        
-        # Migrants start with high Brazilian Portuguese features
-        self.brazilian_vocab = random.uniform(95, 100)  # 95-100%
-        self.brazilian_grammar = random.uniform(90, 100)  # 90-100%
-        self.brazilian_phonetics = random.uniform(85, 100)  # 85-100%
-        self.brazilian_pronouns = random.uniform(80, 100)  # 80-100%
-        
-        # Just arrived
-        self.years_in_portugal = 0
-        
-        # Reveal identity based on model parameter
-        self.reveal_identity = random.random() < model.params["reveal_share_migrants"]
+    __slots__ = ()
@@ -3,13 +3,13 @@ District management for the Portuguese migration simulation.
 Handles spatial distribution and district-level properties.
 """
 
-import random
+import numpy as np
 
 
 class District:
     """Represents a Portuguese administrative district."""
     
-    def __init__(self, district_id, name, is_urban=False):
+    def __init__(self, district_id, name, is_urban=False, rng=None):
         """
         Initialize a district.
         
@@ -17,7 +17,11 @@ class District:
             district_id: Unique identifier for the district
             name: Name of the district
             is_urban: Whether this is an urban district
+            rng: Optional NumPy random generator for the initial properties
         """
+        if rng is None:
+            rng = np.random.default_rng()
+
         self.district_id = district_id
         self.name = name
         self.is_urban = is_urban
@@ -25,35 +29,137 @@ class District:
         # Population counters
         self.num_locals = 0
         self.num_migrants = 0
+        self.density = 0.0  # Proportion of migrants, kept in sync with the counters
         
         # Economic attractiveness (0-100 scale)
-        self.economic_attractiveness = random.uniform(40, 90) if is_urban else random.uniform(20, 60)
+        self.economic_attractiveness = rng.uniform(40, 90) if is_urban else rng.uniform(20, 60)
         
-        # Media infrastructure (urban: 80-95, rural: 35-55)
+        # Initial media infrastructure (urban: 80-95, rural: 35-55); the model
+        # keeps the monthly values in `MigrationModel.district_media`
         if is_urban:
-            self.media_infrastructure = random.uniform(80, 95)
+            self.media_infrastructure = rng.uniform(80, 95)
         else:
-            self.media_infrastructure = random.uniform(35, 55)
+            self.media_infrastructure = rng.uniform(35, 55)
+        
+        # Population slots of the agents living in this district, stored in the
+        # first `n` entries of a buffer that grows by doubling
+        self._agent_buf = np.zeros(64, dtype=np.int32)
+        self.n = 0
+    
+    @property
+    def agent_idx(self):
+        """Population slots of the agents living in this district."""
+        return self._agent_buf[:self.n]
+    
+    def reserve(self, capacity):
+        """
+        Make room for at least `capacity` members without further reallocation.
+        
+        Args:
+            capacity: Number of members the buffer must hold
+        """
+        if capacity > len(self._agent_buf):
+            buf = np.zeros(capacity, dtype=np.int32)
+            buf[:self.n] = self.agent_idx
+            self._agent_buf = buf
+    
+    def add_agents(self, population, indices):
+        """
+        Add a batch of agents to this district.
+        
+        Args:
+            population: Population holding the agents' data
+            indices: Population slots of the agents
+        """
+        indices = np.asarray(indices, dtype=np.int32)
+        end = self.n + len(indices)
+        if end > len(self._agent_buf):
+            self.reserve(max(end, 2 * len(self._agent_buf)))
+        self._agent_buf[self.n:end] = indices
+        population.district_pos[indices] = np.arange(self.n, end)
+        self.n = end
+        
+        num_new_migrants = int(np.count_nonzero(population.is_migrant[indices]))
+        self.num_migrants += num_new_migrants
+        self.num_locals += len(indices) - num_new_migrants
+        self._update_density()
+    
+    def set_members(self, population, indices):
+        """
+        Replace the member slots after the population has been reordered.
         
-        # Lists to track agents in this district
-        self.agents = []
+        Args:
+            population: Population holding the agents' data
+            indices: New population slots of the same agents
+        """
+        self.n = 0
+        if len(indices) > len(self._agent_buf):
+            self.reserve(2 * len(indices))
+        self._agent_buf[:len(indices)] = indices
+        population.district_pos[indices] = np.arange(len(indices))
+        self.n = len(indices)
     
-    def add_agent(self, agent):
+    def add_agent(self, population, index):
         """Add an agent to this district."""
-        self.agents.append(agent)
-        if agent.__class__.__name__ == "LocalAgent":
-            self.num_locals += 1
+        self.add_agents(population, [index])
+    
+    def has_agent(self, population, index):
+        """Check in O(1) whether the agent at `index` lives in this district."""
+        pos = population.district_pos[index]
+        return 0 <= pos < self.n and self._agent_buf[pos] == index
+    
+    def remove_agent(self, population, index):
+        """Remove an agent from this district in O(1) by swapping in the last member."""
+        if not self.has_agent(population, index):
+            return
+        pos = population.district_pos[index]
+        last = self._agent_buf[self.n - 1]
+        self._agent_buf[pos] = last
+        population.district_pos[last] = pos
+        population.district_pos[index] = -1
+        self.n -= 1
+        
+        if population.is_migrant[index]:
+            self.num_migrants -= 1
         else:
-            self.num_migrants += 1
+            self.num_locals -= 1
+        self._update_density()
+    
+    def remove_agents(self, population, indices):
+        """
+        Remove a batch of agents from this district, keeping the others in order.
+        
+        Args:
+            population: Population holding the agents' data
+            indices: Population slots of the agents (non-members are ignored)
+        """
+        indices = np.asarray(indices, dtype=np.int32)
+        pos = population.district_pos[indices]
+        in_range = (pos >= 0) & (pos < self.n)
+        members = in_range.copy()
+        members[in_range] = self._agent_buf[pos[in_range]] == indices[in_range]
+        indices = indices[members]
+        if len(indices) == 0:
+            return
+        
+        # Compact the survivors to the front of the buffer in one pass
+        keep = np.ones(self.n, dtype=np.bool_)
+        keep[pos[members]] = False
+        survivors = self.agent_idx[keep]
+        population.district_pos[indices] = -1
+        self.n = 0
+        self._agent_buf[:len(survivors)] = survivors
+        population.district_pos[survivors] = np.arange(len(survivors))
+        self.n = len(survivors)
+        
+        num_removed_migrants = int(np.count_nonzero(population.is_migrant[indices]))
+        self.num_migrants -= num_removed_migrants
+        self.num_locals -= len(indices) - num_removed_migrants
+        self._update_density()
     
-    def remove_agent(self, agent):
-        """Remove an agent from this district."""
-        if agent in self.agents:
-            self.agents.remove(agent)
-            if agent.__class__.__name__ == "LocalAgent":
-                self.num_locals -= 1
-            else:
-                self.num_migrants -= 1
+    def _update_density(self):
+        """Recompute the cached Brazilian speaker density from the counters."""
+        self.density = self.num_migrants / max(self.num_locals + self.num_migrants, 1)
     
     def get_brazilian_speaker_density(self):
         """
@@ -62,47 +168,47 @@ class District:
         Returns:
             Proportion of migrants in the district (0-1)
         """
-        total = self.num_locals + self.num_migrants
-        if total == 0:
-            return 0
-        return self.num_migrants / total
+        return self.density
     
-    def update_media_infrastructure(self):
-        """Update media infrastructure (can change monthly)."""
-        # Small random walk
-        change = random.uniform(-2, 2)
-        self.media_infrastructure = max(0, min(100, self.media_infrastructure + change))
-    
-    def get_agents_by_type(self, agent_type):
+    def get_agents_by_type(self, population, agent_type):
         """
         Get all agents of a specific type in this district.
         
         Args:
+            population: Population holding the agents' data
             agent_type: Class name ("LocalAgent" or "MigrantAgent")
         
         Returns:
-            List of agents of the specified type
+            Array of population slots of the agents of the specified type
         """
-        return [agent for agent in self.agents if agent.__class__.__name__ == agent_type]
+        members = self.agent_idx
+        return members[population.is_migrant[members] == (agent_type == "MigrantAgent")]
     
-    def get_agents_by_age_range(self, min_age, max_age):
+    def get_agents_by_age_range(self, population, min_age, max_age):
         """
         Get agents within a specific age range.
         
         Args:
+            population: Population holding the agents' data
             min_age: Minimum age (inclusive)
             max_age: Maximum age (exclusive)
         
         Returns:
-            List of agents in the age range
+            Array of population slots of the agents in the age range
         """
-        return [agent for agent in self.agents if min_age <= agent.age < max_age]
+        # Members are always alive (deaths leave the district at once), so no alive filter
+        members = self.agent_idx
+        ages = population.age[members]
+        return members[(ages >= min_age) & (ages < max_age)]
 
 
-def create_portugal_districts():
+def create_portugal_districts(rng=None):
     """
     Create a simplified representation of Portuguese districts.
     
+    Args:
+        rng: Optional NumPy random generator for the districts' initial properties
+    
     Returns:
         Dictionary mapping district IDs to District objects
     """
@@ -131,43 +237,83 @@ def create_portugal_districts():
     
     districts = {}
     for district_id, name, is_urban in districts_data:
-        districts[district_id] = District(district_id, name, is_urban)
+        districts[district_id] = District(district_id, name, is_urban, rng)
     
     return districts
 
 
-def select_migration_district(districts, strategy="economic"):
+def district_arrays(districts):
+    """
+    Collect per-district properties into flat arrays.
+    
+    Args:
+        districts: Dictionary of District objects
+    
+    Returns:
+        Tuple (district_ids, economic_attractiveness, speaker_density) of arrays
+        in the dictionary's order
+    """
+    district_list = list(districts.values())
+    district_ids = np.array([d.district_id for d in district_list], dtype=np.int16)
+    economic_attractiveness = np.array([d.economic_attractiveness for d in district_list], dtype=np.float32)
+    speaker_density = np.array([d.density for d in district_list], dtype=np.float32)
+    return district_ids, economic_attractiveness, speaker_density
+
+
+def _top_k(values, k=5):
+    """Positions of the `k` largest values, in no particular order."""
+    if len(values) <= k:
+        return np.arange(len(values))
+    return np.argpartition(values, -k)[-k:]
+
+
+def select_migration_districts(district_ids, economic_attractiveness, speaker_density, strategies, rng):
+    """
+    Select districts for a batch of new migrants to settle in.
+    
+    Args:
+        district_ids: Array of district IDs
+        economic_attractiveness: Economic attractiveness per district
+        speaker_density: Brazilian speaker density per district
+        strategies: Selection strategy per migrant ("economic", "ethnic" or other for random)
+        rng: NumPy random generator
+    
+    Returns:
+        Array of district IDs where the migrants will settle
+    """
+    strategies = np.asarray(strategies)
+    chosen = rng.choice(district_ids, len(strategies))  # Random selection by default
+    
+    # Ethnic: choose from top districts with existing Brazilian community
+    top_density = _top_k(speaker_density)
+    candidates = district_ids[top_density[speaker_density[top_density] > 0]]
+    ethnic = strategies == "ethnic"
+    if len(candidates):
+        chosen[ethnic] = rng.choice(candidates, np.count_nonzero(ethnic))
+        economic = strategies == "economic"
+    else:
+        # Fall back to economic strategy if no Brazilian communities exist
+        economic = (strategies == "economic") | ethnic
+    
+    # Economic: choose from top 5 economically attractive districts
+    top_5 = district_ids[_top_k(economic_attractiveness)]
+    chosen[economic] = rng.choice(top_5, np.count_nonzero(economic))
+    return chosen
+
+
+def select_migration_district(districts, strategy="economic", rng=None):
     """
     Select a district for a new migrant to settle in.
     
     Args:
         districts: Dictionary of District objects
         strategy: Selection strategy ("economic" or "ethnic")
+        rng: Optional NumPy random generator
     
     Returns:
         District ID where migrant will settle
     """
-    if strategy == "economic":
-        # Choose from top 5 economically attractive districts
-        sorted_districts = sorted(districts.values(), 
-                                 key=lambda d: d.economic_attractiveness, 
-                                 reverse=True)
-        top_5 = sorted_districts[:5]
-        return random.choice(top_5).district_id
-    
-    elif strategy == "ethnic":
-        # Choose district with high Brazilian speaker density
-        sorted_districts = sorted(districts.values(), 
-                                 key=lambda d: d.get_brazilian_speaker_density(), 
-                                 reverse=True)
-        # Choose from top districts with existing Brazilian community
-        candidates = [d for d in sorted_districts[:5] if d.num_migrants > 0]
-        if candidates:
-            return random.choice(candidates).district_id
-        else:
-            # Fall back to economic strategy if no Brazilian communities exist
-            return select_migration_district(districts, "economic")
-    
-    else:
-        # Random selection
-        return random.choice(list(districts.keys()))
+    if rng is None:
+        rng = np.random.default_rng()
+    chosen = select_migration_districts(*district_arrays(districts), [strategy], rng)
+    return int(chosen[0])
@@ -3,28 +3,209 @@ GUI Application for Brazilian-Portuguese Migration ABM
 Interactive interface for running simulations with custom parameters
 """
 
+import argparse
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
+import multiprocessing
+import queue
 import threading
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from matplotlib.figure import Figure
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
 import os
+import re
 
-from model import MigrationModel
-from visualization import plot_all_features_comparison, export_data_to_csv
+# matplotlib, the model and the plotting and export helpers are imported on
+# first use, so the window appears without waiting for them to load
+
+# Default value of every parameter shown in the GUI; the parameter panel and the
+# CLI options both read them from here (except --num-runs, one headless run by default)
+DEFAULT_PARAMETERS = {
+    "number_locals": 1000,
+    "number_migrants": 100,
+    "annual_br_inflow": 120,
+    "local_birth_rate": 0.04,
+    "migrant_birth_rate": 0.06,
+    "num_school_interactions": 5,
+    "num_workplace_interactions": 3,
+    "prob_interaction_market": 0.3,
+    "base_media_influence": 0.5,
+    "reveal_share_locals": 0.3,
+    "reveal_share_migrants": 0.7,
+    "vocab_influence_rate": 0.5,
+    "grammar_influence_rate": 0.3,
+    "pronoun_influence_rate": 0.25,
+    "phonetic_influence_rate": 0.15,
+    "simulation_years": 20,
+    "num_runs": 4,
+}
+
+# Worker processes are spawned rather than forked: forking a process that has
+# run the parallel Numba kernels can deadlock the child
+_MP = multiprocessing.get_context("spawn")
+
+# Interval at which the UI thread picks up simulation progress (ms)
+UI_POLL_INTERVAL = 50
+
+# Interval at which the UI thread checks for finished batch runs (ms)
+BATCH_POLL_INTERVAL = 100
+
+
+# Text an entry may hold while a number is typed (empty is allowed, so a field can be cleared).
+# Tcl would read leading zeros as octal, so integers may not have them.
+_INT_TEXT = re.compile(r"(0|[1-9]\d*)?")
+_FLOAT_TEXT = re.compile(r"\d*\.?\d*")
+
+
+def _import_matplotlib():
+    """Import the matplotlib pieces used by the GUI and apply its rendering settings"""
+    import matplotlib
+    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+    from matplotlib.figure import Figure
+    
+    # Simplify long line plots (many monthly ticks) to what is visible at screen resolution
+    matplotlib.rcParams["path.simplify"] = True
+    matplotlib.rcParams["path.simplify_threshold"] = 1.0
+    return Figure, FigureCanvasTkAgg
+
+
+def run_headless(params, simulation_years, csv_path=None, stop_event=None, on_step=None):
+    """
+    Run one simulation without any GUI.
+    
+    Args:
+        params: Dictionary of model parameters
+        simulation_years: Number of years to simulate
+        csv_path: Optional CSV file to write the results to
+        stop_event: Optional event that stops the run when set
+        on_step: Optional callback `on_step(model, step, total_steps)` after every month
+    
+    Returns:
+        Collected data as NumPy arrays (int32 tick and counts, float32 means),
+        or None if the run was stopped
+    """
+    from model import MigrationModel
+    
+    # Create model
+    model = MigrationModel(params)
+    model.setup()
+    
+    # Run simulation
+    total_steps = simulation_years * 12
+    for step in range(total_steps):
+        if stop_event is not None and stop_event.is_set():
+            return None
+        
+        model.step()
+        
+        if on_step is not None:
+            on_step(model, step, total_steps)
+    
+    # Compact typed arrays are cheap to send back from a worker process and to plot
+    results = {key: np.asarray(values, dtype=np.float32 if key.startswith("mean_") else np.int32)
+               for key, values in model.get_results().items()}
+    if csv_path is not None:
+        from visualization import export_data_to_csv
+        export_data_to_csv(results, csv_path)
+    return results
+
+
+def _simulation_worker(params, simulation_years, messages, stop_event, live=False):
+    """
+    Run a simulation in a worker process, reporting back through a queue.
+    
+    Posts ("progress", percent, text, point) about every 1% of the run (every
+    month with `live`), then either ("results", data), ("stopped",) or
+    ("error", message), and finally ("done",). With `live`, point is the
+    month's (year, locals, migrants); otherwise None.
+    """
+    def report_progress(model, step, total_steps):
+        # Every message is pickled across the process boundary, so without a live
+        # plot to feed only ~100 updates are sent, always including the last month
+        if not live and (step + 1) % max(1, total_steps // 100) and step + 1 != total_steps:
+            return
+        
+        progress = (step + 1) / total_steps * 100
+        point = None
+        if live:
+            data = model.data_collector
+            point = (data["tick"][-1] / 12, data["total_locals"][-1], data["total_migrants"][-1])
+        messages.put(("progress", progress,
+                      f"Running: Year {step//12 + 1}/{simulation_years}, Month {step%12 + 1}", point))
+    
+    try:
+        results = run_headless(params, simulation_years, stop_event=stop_event, on_step=report_progress)
+        if results is None:
+            messages.put(("stopped",))
+        else:
+            messages.put(("results", results))
+    
+    except Exception as e:
+        messages.put(("error", str(e)))
+    
+    finally:
+        messages.put(("done",))
+
+
+# Stop event and per-run progress values of the batch run a pool worker belongs
+# to, set by `_init_batch_worker` when the worker starts
+_batch_stop_event = None
+_batch_progress = None
+
+
+def _init_batch_worker(stop_event, progress):
+    """Keep the batch's stop event and progress values in a pool worker"""
+    global _batch_stop_event, _batch_progress
+    _batch_stop_event, _batch_progress = stop_event, progress
+
+
+def _batch_run(index, params, num_steps, seed):
+    """Run simulation `index` of a batch in a pool worker; returns None if the batch was stopped"""
+    from model import run_one
+    return run_one(params, num_steps, seed, progress=_batch_progress[index], stop_event=_batch_stop_event)
+
+
+def _migrant_proportion(results):
+    """Migrant share of the population (%) at every tick of a run"""
+    total_pop = results["total_locals"] + results["total_migrants"]
+    return np.divide(results["total_migrants"] * 100.0, total_pop,
+                     out=np.zeros(len(total_pop)), where=total_pop > 0)
 
 
 class MigrationModelGUI:
+    # Parameters entered as whole numbers; all others are floats
+    _INT_KEYS = frozenset({
+        "number_locals", "number_migrants", "annual_br_inflow",
+        "num_school_interactions", "num_workplace_interactions", "simulation_years", "num_runs",
+    })
+    
     def __init__(self, root):
         self.root = root
         self.root.title("Language Evolution Through Immigration Dynamics")
         self.root.geometry("1400x900")
         
-        # Model and results
-        self.model = None
+        # Results and the simulation worker process
         self.results = None
         self.is_running = False
+        self._process = None
+        self._messages = None
+        self._executor = None
+        self._futures = []
+        self._batch_progress = []  # Shared count of completed months per batch run
+        self._batch_steps = 0
+        self.batch_results = []
+        self.results_std = None  # Spread of the batch runs around the shown mean; None for one run
+        
+        # Results of the last completed single run, keyed by its parameters
+        self._last_run_key = None
+        self._last_results = None
+        self._pending_run_key = None
+        self._stop_event = _MP.Event()  # Set to ask the worker to stop; a new one per run
+        
+        # Result widgets, created on the first run and updated in place afterwards
+        self._demo_canvas = None
+        self._features_canvas = None
+        self._stats_text = None
+        self._live = None  # State of the live Demographics plot while a run is drawn live
         
         # Create main layout
         self.create_widgets()
@@ -54,75 +235,96 @@ class MigrationModelGUI:
         param_frame = ttk.LabelFrame(parent, text="Simulation Parameters", padding="10")
         param_frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S), padx=(0, 5))
         
-        # Scrollable frame for parameters
-        canvas = tk.Canvas(param_frame, width=400)
-        scrollbar = ttk.Scrollbar(param_frame, orient="vertical", command=canvas.yview)
-        scrollable_frame = ttk.Frame(canvas)
-        
-        scrollable_frame.bind(
-            "<Configure>",
-            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
-        )
-        
-        canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
+        # Scrollable frame for parameters, so every field stays reachable on small screens
+        entries_container = ttk.Frame(param_frame)
+        entries_container.pack(side="top", fill="both", expand=True)
+        canvas = tk.Canvas(entries_container, width=400, highlightthickness=0)
+        scrollbar = ttk.Scrollbar(entries_container, orient="vertical", command=canvas.yview)
+        entries_frame = ttk.Frame(canvas)
+        canvas.create_window((0, 0), window=entries_frame, anchor="nw")
         canvas.configure(yscrollcommand=scrollbar.set)
-        
         canvas.pack(side="left", fill="both", expand=True)
         scrollbar.pack(side="right", fill="y")
         
-        # Parameter dictionary to store entry widgets
-        self.param_entries = {}
+        # Recompute the scroll region once Tk is idle, so a burst of layout changes
+        # (e.g. creating all the entries) measures the frame only once
+        scroll_update = None
         
-        # Define parameter groups
+        def update_scroll_region():
+            nonlocal scroll_update
+            scroll_update = None
+            canvas.configure(scrollregion=canvas.bbox("all"))
+        
+        def schedule_scroll_update(event):
+            nonlocal scroll_update
+            if scroll_update is None:
+                scroll_update = self.root.after_idle(update_scroll_region)
+        
+        entries_frame.bind("<Configure>", schedule_scroll_update)
+        
+        # Parameter dictionary to store the entries' typed variables
+        self.param_vars = {}
+        
+        # Keystroke validators, so entries only ever hold (partial) numbers
+        validate_int = (self.root.register(lambda text: _INT_TEXT.fullmatch(text) is not None), "%P")
+        validate_float = (self.root.register(lambda text: _FLOAT_TEXT.fullmatch(text) is not None), "%P")
+        
+        # Define parameter groups: (key, label, tooltip); defaults come from DEFAULT_PARAMETERS
         param_groups = [
             ("Population", [
-                ("number_locals", "Initial Locals", 1000, "Number of initial local agents"),
-                ("number_migrants", "Initial Migrants", 100, "Number of initial migrant agents"),
-                ("annual_br_inflow", "Annual Immigration", 120, "Brazilian immigrants per year"),
+                ("number_locals", "Initial Locals", "Number of initial local agents"),
+                ("number_migrants", "Initial Migrants", "Number of initial migrant agents"),
+                ("annual_br_inflow", "Annual Immigration", "Brazilian immigrants per year"),
             ]),
             ("Demographic Rates", [
-                ("local_birth_rate", "Local Birth Rate", 0.04, "Annual birth rate for locals"),
-                ("migrant_birth_rate", "Migrant Birth Rate", 0.06, "Annual birth rate for migrants"),
+                ("local_birth_rate", "Local Birth Rate", "Annual birth rate for locals"),
+                ("migrant_birth_rate", "Migrant Birth Rate", "Annual birth rate for migrants"),
             ]),
             ("Social Interactions", [
-                ("num_school_interactions", "School Interactions", 5, "Monthly peer interactions"),
-                ("num_workplace_interactions", "Workplace Interactions", 3, "Monthly colleague interactions"),
-                ("prob_interaction_market", "Public Interaction Prob", 0.3, "Monthly probability of public encounter"),
+                ("num_school_interactions", "School Interactions", "Monthly peer interactions"),
+                ("num_workplace_interactions", "Workplace Interactions", "Monthly colleague interactions"),
+                ("prob_interaction_market", "Public Interaction Prob", "Monthly probability of public encounter"),
             ]),
             ("Media & Identity", [
-                ("base_media_influence", "Media Influence", 0.5, "Base media influence (0-1)"),
-                ("reveal_share_locals", "Locals Reveal %", 0.3, "Proportion of locals revealing BR features"),
-                ("reveal_share_migrants", "Migrants Reveal %", 0.7, "Proportion of migrants revealing BR features"),
+                ("base_media_influence", "Media Influence", "Base media influence (0-1)"),
+                ("reveal_share_locals", "Locals Reveal %", "Proportion of locals revealing BR features"),
+                ("reveal_share_migrants", "Migrants Reveal %", "Proportion of migrants revealing BR features"),
             ]),
             ("Linguistic Influence Rates", [
-                ("vocab_influence_rate", "Vocabulary Rate", 0.5, "Vocabulary influence per interaction"),
-                ("grammar_influence_rate", "Grammar Rate", 0.3, "Grammar influence per interaction"),
-                ("pronoun_influence_rate", "Pronoun Rate", 0.25, "Pronoun influence per interaction"),
-                ("phonetic_influence_rate", "Phonetic Rate", 0.15, "Phonetic influence per interaction"),
+                ("vocab_influence_rate", "Vocabulary Rate", "Vocabulary influence per interaction"),
+                ("grammar_influence_rate", "Grammar Rate", "Grammar influence per interaction"),
+                ("pronoun_influence_rate", "Pronoun Rate", "Pronoun influence per interaction"),
+                ("phonetic_influence_rate", "Phonetic Rate", "Phonetic influence per interaction"),
             ]),
             ("Simulation", [
-                ("simulation_years", "Simulation Years", 20, "Number of years to simulate"),
+                ("simulation_years", "Simulation Years", "Number of years to simulate"),
+                ("num_runs", "Batch Runs", "Number of simulations in a batch run"),
             ]),
         ]
         
         row = 0
         for group_name, params in param_groups:
             # Group header
-            group_label = ttk.Label(scrollable_frame, text=group_name, font=("Arial", 10, "bold"))
+            group_label = ttk.Label(entries_frame, text=group_name, font=("Arial", 10, "bold"))
             group_label.grid(row=row, column=0, columnspan=2, sticky=tk.W, pady=(10, 5))
             row += 1
             
             # Parameters in group
-            for param_key, param_label, default_value, tooltip in params:
-                label = ttk.Label(scrollable_frame, text=param_label + ":")
+            for param_key, param_label, tooltip in params:
+                default_value = DEFAULT_PARAMETERS[param_key]
+                label = ttk.Label(entries_frame, text=param_label + ":")
                 label.grid(row=row, column=0, sticky=tk.W, pady=2, padx=(10, 5))
                 
-                entry = ttk.Entry(scrollable_frame, width=15)
-                entry.insert(0, str(default_value))
+                if param_key in self._INT_KEYS:
+                    var, validate = tk.IntVar(value=default_value), validate_int
+                else:
+                    var, validate = tk.DoubleVar(value=default_value), validate_float
+                entry = ttk.Entry(entries_frame, width=15, textvariable=var,
+                                  validate="key", validatecommand=validate)
                 entry.grid(row=row, column=1, sticky=tk.W, pady=2)
                 
-                # Store entry widget
-                self.param_entries[param_key] = entry
+                # Store entry variable
+                self.param_vars[param_key] = var
                 
                 # Tooltip (simplified - just show on label)
                 self.create_tooltip(label, tooltip)
@@ -136,6 +338,9 @@ class MigrationModelGUI:
         self.run_button = ttk.Button(button_frame, text="Run Simulation", command=self.run_simulation)
         self.run_button.pack(side="left", padx=5)
         
+        self.batch_button = ttk.Button(button_frame, text="Run Batch", command=self.run_batch)
+        self.batch_button.pack(side="left", padx=5)
+        
         self.stop_button = ttk.Button(button_frame, text="Stop", command=self.stop_simulation, state="disabled")
         self.stop_button.pack(side="left", padx=5)
         
@@ -146,6 +351,17 @@ class MigrationModelGUI:
         export_button.pack(side="left", padx=5)
         self.export_button = export_button
         
+        # Reusing results only makes sense when reruns are not expected to differ
+        self.use_cache_var = tk.BooleanVar(value=False)
+        cache_check = ttk.Checkbutton(param_frame, text="Reuse results for identical parameters",
+                                      variable=self.use_cache_var)
+        cache_check.pack(side="bottom", anchor="w", pady=(5, 0))
+        
+        self.live_plot_var = tk.BooleanVar(value=False)
+        live_check = ttk.Checkbutton(param_frame, text="Live population plot while running",
+                                     variable=self.live_plot_var)
+        live_check.pack(side="bottom", anchor="w", pady=(5, 0))
+        
         # Progress bar
         self.progress_var = tk.DoubleVar()
         self.progress_bar = ttk.Progressbar(param_frame, variable=self.progress_var, maximum=100)
@@ -177,6 +393,9 @@ class MigrationModelGUI:
         self.stats_tab = ttk.Frame(self.notebook)
         self.notebook.add(self.stats_tab, text="Summary Statistics")
         
+        # Each tab's content lives in one container frame, so it can be cleared in one call
+        self._containers = {}
+        
         # Initialize with placeholder
         self.show_placeholder()
         
@@ -195,61 +414,39 @@ class MigrationModelGUI:
     def show_placeholder(self):
         """Show placeholder text before simulation runs"""
         for tab in [self.demo_tab, self.features_tab, self.stats_tab]:
-            for widget in tab.winfo_children():
-                widget.destroy()
+            container = self._new_container(tab)
             
-            label = ttk.Label(tab, text="Run a simulation to see results", 
+            label = ttk.Label(container, text="Run a simulation to see results", 
                             font=("Arial", 12), foreground="gray")
             label.pack(expand=True)
     
+    def _new_container(self, tab):
+        """Replace a tab's content with a fresh, empty container frame"""
+        if tab in self._containers:
+            self._containers[tab].destroy()
+        container = ttk.Frame(tab)
+        container.pack(fill="both", expand=True)
+        self._containers[tab] = container
+        return container
+    
     def get_parameters(self):
         """Get parameters from entry widgets"""
-        params = {}
-        
-        # Get all parameters
-        for key, entry in self.param_entries.items():
-            try:
-                value = entry.get()
-                # Convert to appropriate type
-                if key in ["number_locals", "number_migrants", "annual_br_inflow", 
-                          "num_school_interactions", "num_workplace_interactions", "simulation_years"]:
-                    params[key] = int(value)
-                else:
-                    params[key] = float(value)
-            except ValueError:
-                messagebox.showerror("Invalid Input", f"Invalid value for {key}: {value}")
-                return None
-        
-        return params
+        # The validators only admit numbers, so the typed variables convert directly;
+        # the one way to fail is an entry left empty or as a lone "."
+        try:
+            return {key: var.get() for key, var in self.param_vars.items()}
+        except tk.TclError:
+            messagebox.showerror("Invalid Input", "Please enter a value for every parameter")
+            return None
     
     def reset_parameters(self):
         """Reset all parameters to defaults"""
-        defaults = {
-            "number_locals": 1000,
-            "number_migrants": 100,
-            "annual_br_inflow": 120,
-            "local_birth_rate": 0.04,
-            "migrant_birth_rate": 0.06,
-            "num_school_interactions": 5,
-            "num_workplace_interactions": 3,
-            "prob_interaction_market": 0.3,
-            "base_media_influence": 0.5,
-            "reveal_share_locals": 0.3,
-            "reveal_share_migrants": 0.7,
-            "vocab_influence_rate": 0.5,
-            "grammar_influence_rate": 0.3,
-            "pronoun_influence_rate": 0.25,
-            "phonetic_influence_rate": 0.15,
-            "simulation_years": 20,
-        }
-        
-        for key, value in defaults.items():
-            if key in self.param_entries:
-                self.param_entries[key].delete(0, tk.END)
-                self.param_entries[key].insert(0, str(value))
+        for key, value in DEFAULT_PARAMETERS.items():
+            if key in self.param_vars:
+                self.param_vars[key].set(value)
     
     def run_simulation(self):
-        """Run the simulation in a separate thread"""
+        """Run the simulation in a separate process"""
         
         # Get parameters
         params = self.get_parameters()
@@ -258,67 +455,194 @@ class MigrationModelGUI:
         
         # Extract simulation years
         simulation_years = params.pop("simulation_years")
+        params.pop("num_runs")
+        
+        # Show the previous results again if nothing changed since the last run
+        run_key = tuple(sorted(params.items())) + (simulation_years,)
+        if self.use_cache_var.get() and run_key == self._last_run_key:
+            self.results, self.results_std = self._last_results, None
+            self.display_results()
+            self.progress_var.set(100)
+            self.update_status("Showing cached results", "green")
+            return
+        self._pending_run_key = run_key
         
-        # Disable run button, enable stop button
-        self.run_button.config(state="disabled")
-        self.stop_button.config(state="normal")
-        self.export_button.config(state="disabled")
-        self.is_running = True
+        self._start_running()
         
         # Update status
         self.status_label.config(text="Initializing simulation...", foreground="orange")
         self.progress_var.set(0)
         
-        # Run in thread
-        thread = threading.Thread(target=self._run_simulation_thread, args=(params, simulation_years))
-        thread.daemon = True
-        thread.start()
+        # Optionally draw the population curves as the simulation runs
+        live = self.live_plot_var.get()
+        if live:
+            self._start_live_plot(simulation_years)
+        
+        # Run in a separate process, so the simulation does not compete with Tk for the GIL
+        self._messages = _MP.Queue()
+        self._process = _MP.Process(
+            target=_simulation_worker,
+            args=(params, simulation_years, self._messages, self._stop_event, live),
+            daemon=True,
+        )
+        self._process.start()
+        
+        # Show progress from the main thread while the simulation runs
+        self.root.after(UI_POLL_INTERVAL, self._poll_ui)
     
-    def _run_simulation_thread(self, params, simulation_years):
-        """Run simulation in background thread"""
+    def run_batch(self):
+        """Run several independent simulations in parallel processes"""
+        
+        # Get parameters
+        params = self.get_parameters()
+        if params is None:
+            return
+        
+        # Extract simulation years and number of runs
+        simulation_years = params.pop("simulation_years")
+        num_runs = params.pop("num_runs")
+        if num_runs < 1:
+            messagebox.showerror("Invalid Input", "Batch Runs must be at least 1")
+            return
+        
+        self._start_running()
+        self.status_label.config(text=f"Running batch: 0/{num_runs} simulations complete",
+                                 foreground="orange")
+        self.progress_var.set(0)
+        
+        # One process per run, up to the number of cores; each run gets its own seed.
+        # The workers share the stop event, so Stop also ends the runs in progress.
+        seeds = np.random.default_rng().integers(0, 2**32, num_runs)
+        self._batch_steps = simulation_years * 12
+        self._batch_progress = [_MP.Value("i", 0) for _ in range(num_runs)]
+        self._executor = ProcessPoolExecutor(max_workers=min(num_runs, os.cpu_count() or 1), mp_context=_MP,
+                                             initializer=_init_batch_worker,
+                                             initargs=(self._stop_event, self._batch_progress))
+        self._futures = [self._executor.submit(_batch_run, index, params, self._batch_steps, int(seed))
+                         for index, seed in enumerate(seeds)]
+        
+        self.root.after(BATCH_POLL_INTERVAL, self._poll_batch)
+    
+    def _poll_batch(self):
+        """Track the batch runs' progress and show their mean and spread once all are done"""
+        if self._stop_event.is_set():
+            # Drop runs that have not started; runs in progress see the stop event and return
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self.update_status("Batch stopped", "red")
+            self._finish_simulation()
+            return
+        
+        # Progress counts the months simulated by every run, so it moves while runs are in progress
+        num_done = sum(future.done() for future in self._futures)
+        steps_done = sum(value.value for value in self._batch_progress)
+        self.progress_var.set(steps_done / (len(self._futures) * self._batch_steps) * 100)
+        if num_done < len(self._futures):
+            self.update_status(f"Running batch: {num_done}/{len(self._futures)} simulations complete",
+                               "orange")
+            self.root.after(BATCH_POLL_INTERVAL, self._poll_batch)
+            return
+        
+        self._executor.shutdown()
         try:
-            # Create model
-            self.model = MigrationModel(params)
-            self.model.setup()
+            self.batch_results = [future.result() for future in self._futures]
+        except Exception as e:
+            messagebox.showerror("Simulation Error", str(e))
+            self.update_status(f"Error: {str(e)}", "red")
+        else:
+            # Show the mean of every series across runs (population counts rounded),
+            # with the standard deviation as a band around it
+            self.results, self.results_std = {}, {}
+            for key in self.batch_results[0]:
+                runs = np.array([run[key] for run in self.batch_results])
+                mean = runs.mean(axis=0)
+                self.results[key] = np.rint(mean).astype(int) if key.startswith("total_") else mean
+                self.results_std[key] = runs.std(axis=0)
+            self.results_std["migrant_prop"] = np.std([_migrant_proportion(run) for run in self.batch_results],
+                                                      axis=0)
+            self.display_results()
+            self.update_status(f"Batch complete! Mean ± std of {len(self.batch_results)} runs", "green")
+        self._finish_simulation()
+    
+    def _start_running(self):
+        """Switch the controls to the running state"""
+        # Disable run buttons, enable stop button
+        self.run_button.config(state="disabled")
+        self.batch_button.config(state="disabled")
+        self.stop_button.config(state="normal")
+        self.export_button.config(state="disabled")
+        self.is_running = True
+        # A fresh event rather than clearing the old one: workers of a stopped batch
+        # may not have seen it yet and would otherwise run on in the background
+        self._stop_event = _MP.Event()
+    
+    def _poll_ui(self):
+        """Apply messages from the simulation worker and reschedule while it runs"""
+        progress = None
+        while True:
+            try:
+                message = self._messages.get_nowait()
+            except queue.Empty:
+                break
             
-            # Run simulation with progress updates
-            total_steps = simulation_years * 12
-            for step in range(total_steps):
-                if not self.is_running:
-                    self.root.after(0, self.update_status, "Simulation stopped", "red")
-                    break
-                
-                self.model.step()
-                
-                # Update progress
-                progress = (step + 1) / total_steps * 100
-                self.root.after(0, self.progress_var.set, progress)
-                self.root.after(0, self.update_status, 
-                              f"Running: Year {step//12 + 1}/{simulation_years}, Month {step%12 + 1}", 
-                              "orange")
+            kind = message[0]
+            if kind == "progress":
+                # Only the latest progress needs to be shown, but every live point is kept
+                progress = message[1:3]
+                if message[3] is not None and self._live is not None:
+                    self._add_live_point(*message[3])
+                continue
             
-            if self.is_running:
-                # Get results
-                self.results = self.model.get_results()
-                
-                # Update GUI with results
-                self.root.after(0, self.display_results)
-                self.root.after(0, self.update_status, "Simulation complete!", "green")
+            # Show pending progress before any final status
+            if progress is not None:
+                self._show_progress(*progress)
+                progress = None
             
-        except Exception as e:
-            self.root.after(0, messagebox.showerror, "Simulation Error", str(e))
-            self.root.after(0, self.update_status, f"Error: {str(e)}", "red")
+            if kind == "results":
+                self.results, self.results_std = message[1], None
+                self._last_run_key, self._last_results = self._pending_run_key, self.results
+                self._stop_live_plot()
+                self.display_results()
+                self.update_status("Simulation complete!", "green")
+            elif kind == "stopped":
+                self.update_status("Simulation stopped", "red")
+            elif kind == "error":
+                messagebox.showerror("Simulation Error", message[1])
+                self.update_status(f"Error: {message[1]}", "red")
+            elif kind == "done":
+                self._finish_simulation()
+        
+        if progress is not None:
+            self._show_progress(*progress)
+        if self._live is not None:
+            self._update_live_plot()
+        
+        if self.is_running:
+            self.root.after(UI_POLL_INTERVAL, self._poll_ui)
+    
+    def _show_progress(self, progress, text):
+        """Update progress bar and status label"""
+        self.progress_var.set(progress)
+        self.update_status(text, "orange")
+    
+    def _finish_simulation(self):
+        """Clean up the worker process or batch executor and re-enable the controls"""
+        if self._process is not None:
+            self._process.join()
+            self._process = None
+        self._executor = None
+        self._futures = []
+        self._stop_live_plot()
+        self.is_running = False
         
-        finally:
-            # Re-enable buttons
-            self.root.after(0, self.run_button.config, {"state": "normal"})
-            self.root.after(0, self.stop_button.config, {"state": "disabled"})
-            self.root.after(0, self.export_button.config, {"state": "normal"})
-            self.is_running = False
+        # Re-enable buttons
+        self.run_button.config(state="normal")
+        self.batch_button.config(state="normal")
+        self.stop_button.config(state="disabled")
+        self.export_button.config(state="normal")
     
     def stop_simulation(self):
         """Stop the running simulation"""
-        self.is_running = False
+        self._stop_event.set()
         self.stop_button.config(state="disabled")
     
     def update_status(self, text, color):
@@ -328,33 +652,55 @@ class MigrationModelGUI:
     def display_results(self):
         """Display simulation results in tabs"""
         
-        # Clear existing widgets
-        for tab in [self.demo_tab, self.features_tab, self.stats_tab]:
-            for widget in tab.winfo_children():
-                widget.destroy()
+        # Clear the placeholders on the first run; later runs reuse the result widgets
+        for tab, widget in [(self.demo_tab, self._demo_canvas), (self.features_tab, self._features_canvas),
+                            (self.stats_tab, self._stats_text)]:
+            if widget is None:
+                self._new_container(tab)
         
         # Tab 1: Demographics
-        self.plot_demographics(self.demo_tab)
+        self.plot_demographics(self._containers[self.demo_tab])
         
         # Tab 2: Linguistic Features
-        self.plot_features(self.features_tab)
+        self.plot_features(self._containers[self.features_tab])
         
         # Tab 3: Summary Statistics
-        self.show_statistics(self.stats_tab)
+        self.show_statistics(self._containers[self.stats_tab])
     
     def plot_demographics(self, parent):
         """Plot demographic dynamics"""
+        new_figure = self._demo_canvas is None
+        if new_figure:
+            self._build_demographics(parent)
+        
+        years = self.results["tick"] / 12
+        series = {
+            "total_locals": self.results["total_locals"],
+            "total_migrants": self.results["total_migrants"],
+            "migrant_prop": _migrant_proportion(self.results),
+        }
+        
+        # Swap in the new data (decimated like the saved plots) and rescale, without rebuilding the axes
+        from visualization import decimate
+        for key, line in self._demo_lines.items():
+            line.set_data(*decimate(years, series[key]))
+        self._update_bands(self._demo_bands, self._demo_lines, years, series)
+        self._redraw(self._demo_canvas, self._demo_axes, new_figure)
+    
+    def _build_demographics(self, parent):
+        """Create the Demographics figure with empty lines"""
+        Figure, FigureCanvasTkAgg = _import_matplotlib()
         fig = Figure(figsize=(8, 6), dpi=100)
         
         # Two subplots
         ax1 = fig.add_subplot(121)
         ax2 = fig.add_subplot(122)
         
-        years = [t/12 for t in self.results["tick"]]
-        
         # Population sizes
-        ax1.plot(years, self.results["total_locals"], label="Locals", color="blue", linewidth=2)
-        ax1.plot(years, self.results["total_migrants"], label="Migrants", color="red", linewidth=2)
+        self._demo_lines = {
+            "total_locals": ax1.plot([], [], label="Locals", color="blue", linewidth=2)[0],
+            "total_migrants": ax1.plot([], [], label="Migrants", color="red", linewidth=2)[0],
+        }
         ax1.set_xlabel("Year")
         ax1.set_ylabel("Population")
         ax1.set_title("Population Dynamics")
@@ -362,9 +708,7 @@ class MigrationModelGUI:
         ax1.grid(True, alpha=0.3)
         
         # Migrant proportion
-        total_pop = [l + m for l, m in zip(self.results["total_locals"], self.results["total_migrants"])]
-        migrant_prop = [m / t * 100 if t > 0 else 0 for m, t in zip(self.results["total_migrants"], total_pop)]
-        ax2.plot(years, migrant_prop, color="purple", linewidth=2)
+        self._demo_lines["migrant_prop"] = ax2.plot([], [], color="purple", linewidth=2)[0]
         ax2.set_xlabel("Year")
         ax2.set_ylabel("Migrant Proportion (%)")
         ax2.set_title("Migrant Proportion Over Time")
@@ -372,89 +716,194 @@ class MigrationModelGUI:
         ax2.axhline(y=50, color='gray', linestyle='--', alpha=0.5, label="50% threshold")
         ax2.legend()
         
-        fig.tight_layout()
-        
         # Embed in tkinter
-        canvas = FigureCanvasTkAgg(fig, parent)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill="both", expand=True)
+        self._demo_bands = {}  # Mean ± std bands of a batch run, by line
+        self._demo_axes = (ax1, ax2)
+        self._demo_canvas = FigureCanvasTkAgg(fig, parent)
+        self._demo_canvas.get_tk_widget().pack(fill="both", expand=True)
     
-    def plot_features(self, parent):
-        """Plot linguistic features"""
-        fig = Figure(figsize=(8, 6), dpi=100)
-        
-        # Four subplots
-        ax1 = fig.add_subplot(221)
-        ax2 = fig.add_subplot(222)
-        ax3 = fig.add_subplot(223)
-        ax4 = fig.add_subplot(224)
-        
-        years = [t/12 for t in self.results["tick"]]
-        
-        # Vocabulary
-        ax1.plot(years, self.results["mean_local_vocab"], label="Locals", color="blue", linewidth=2)
-        ax1.plot(years, self.results["mean_migrant_vocab"], label="Migrants", color="red", linewidth=2)
-        ax1.set_title("Vocabulary")
-        ax1.set_ylabel("Brazilian Feature (%)")
-        ax1.legend(fontsize=8)
-        ax1.grid(True, alpha=0.3)
-        
-        # Grammar
-        ax2.plot(years, self.results["mean_local_grammar"], color="blue", linewidth=2)
-        ax2.plot(years, self.results["mean_migrant_grammar"], color="red", linewidth=2)
-        ax2.set_title("Grammar")
-        ax2.grid(True, alpha=0.3)
-        
-        # Phonetics
-        ax3.plot(years, self.results["mean_local_phonetics"], color="blue", linewidth=2)
-        ax3.plot(years, self.results["mean_migrant_phonetics"], color="red", linewidth=2)
-        ax3.set_title("Phonetics")
-        ax3.set_xlabel("Year")
-        ax3.set_ylabel("Brazilian Feature (%)")
-        ax3.grid(True, alpha=0.3)
+    def _start_live_plot(self, simulation_years):
+        """Prepare the Demographics figure for blitted updates during a run"""
+        if self._demo_canvas is None:
+            self._build_demographics(self._new_container(self.demo_tab))
+            self._demo_canvas.figure.tight_layout()
+        
+        # Fixed axes, so each frame only redraws the lines over a cached background
+        self._clear_bands(self._demo_bands)  # Left from a previous batch
+        ax1, ax2 = self._demo_axes
+        for ax in self._demo_axes:
+            ax.set_xlim(0, simulation_years)
+        ax1.set_ylim(0, 1)  # Grows with the population, see _update_live_plot
+        ax2.set_ylim(0, 100)
+        for line in self._demo_lines.values():
+            line.set_data([], [])
+            line.set_animated(True)
+        
+        self._live = {
+            "years": [], "total_locals": [], "total_migrants": [], "migrant_prop": [],
+            "peak": 0, "background": None,
+            "draw_cid": self._demo_canvas.mpl_connect("draw_event", self._on_live_draw),
+        }
+    
+    def _add_live_point(self, year, num_locals, num_migrants):
+        """Record one month of live population data"""
+        live = self._live
+        total = num_locals + num_migrants
+        live["years"].append(year)
+        live["total_locals"].append(num_locals)
+        live["total_migrants"].append(num_migrants)
+        live["migrant_prop"].append(num_migrants / total * 100 if total > 0 else 0)
+        live["peak"] = max(live["peak"], num_locals, num_migrants)
+    
+    def _update_live_plot(self):
+        """Blit the latest live data onto the Demographics figure"""
+        live = self._live
+        # Only the visible tab is drawn; the data keeps accumulating meanwhile
+        if not live["years"] or self.notebook.select() != str(self.demo_tab):
+            return
         
-        # Pronouns
-        ax4.plot(years, self.results["mean_local_pronouns"], color="blue", linewidth=2)
-        ax4.plot(years, self.results["mean_migrant_pronouns"], color="red", linewidth=2)
-        ax4.set_title("Pronouns")
-        ax4.set_xlabel("Year")
-        ax4.grid(True, alpha=0.3)
+        for key, line in self._demo_lines.items():
+            line.set_data(live["years"], live[key])
         
-        fig.tight_layout()
+        # A full redraw is needed for a new y range or the first frame; it ends in _on_live_draw
+        ax1 = self._demo_axes[0]
+        if live["peak"] > ax1.get_ylim()[1] or live["background"] is None:
+            ax1.set_ylim(0, max(live["peak"] * 1.5, 10))
+            self._demo_canvas.draw_idle()
+            return
         
-        # Embed in tkinter
-        canvas = FigureCanvasTkAgg(fig, parent)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill="both", expand=True)
+        self._demo_canvas.restore_region(live["background"])
+        self._blit_live_lines()
+    
+    def _on_live_draw(self, event):
+        """Cache the static background after a full redraw and paint the live lines on it"""
+        canvas = self._demo_canvas
+        self._live["background"] = canvas.copy_from_bbox(canvas.figure.bbox)
+        self._blit_live_lines()
+    
+    def _blit_live_lines(self):
+        """Draw only the live lines and push them to the screen"""
+        for line in self._demo_lines.values():
+            line.axes.draw_artist(line)
+        self._demo_canvas.blit(self._demo_canvas.figure.bbox)
+    
+    def _stop_live_plot(self):
+        """Return the Demographics figure to normal drawing after a live run"""
+        if self._live is None:
+            return
+        self._demo_canvas.mpl_disconnect(self._live["draw_cid"])
+        self._live = None
+        for line in self._demo_lines.values():
+            line.set_animated(False)
+        for ax in self._demo_axes:
+            ax.set_autoscale_on(True)
+        self._demo_canvas.draw_idle()
+    
+    def plot_features(self, parent):
+        """Plot linguistic features"""
+        new_figure = self._features_canvas is None
+        if new_figure:
+            Figure, FigureCanvasTkAgg = _import_matplotlib()
+            fig = Figure(figsize=(8, 6), dpi=100)
+            
+            # Four subplots
+            ax1 = fig.add_subplot(221)
+            ax2 = fig.add_subplot(222)
+            ax3 = fig.add_subplot(223)
+            ax4 = fig.add_subplot(224)
+            
+            # One local (blue) and one migrant (red) line per feature
+            self._features_lines = {}
+            for ax, feature in zip([ax1, ax2, ax3, ax4], ["vocab", "grammar", "phonetics", "pronouns"]):
+                self._features_lines[f"mean_local_{feature}"] = ax.plot(
+                    [], [], label="Locals", color="blue", linewidth=2)[0]
+                self._features_lines[f"mean_migrant_{feature}"] = ax.plot(
+                    [], [], label="Migrants", color="red", linewidth=2)[0]
+                ax.grid(True, alpha=0.3)
+            
+            ax1.set_title("Vocabulary")
+            ax1.set_ylabel("Brazilian Feature (%)")
+            ax1.legend(fontsize=8)
+            ax2.set_title("Grammar")
+            ax3.set_title("Phonetics")
+            ax3.set_xlabel("Year")
+            ax3.set_ylabel("Brazilian Feature (%)")
+            ax4.set_title("Pronouns")
+            ax4.set_xlabel("Year")
+            
+            # Embed in tkinter
+            self._features_bands = {}  # Mean ± std bands of a batch run, by line
+            self._features_axes = (ax1, ax2, ax3, ax4)
+            self._features_canvas = FigureCanvasTkAgg(fig, parent)
+            self._features_canvas.get_tk_widget().pack(fill="both", expand=True)
+        
+        from visualization import decimate
+        
+        years = self.results["tick"] / 12
+        for key, line in self._features_lines.items():
+            line.set_data(*decimate(years, self.results[key]))
+        self._update_bands(self._features_bands, self._features_lines, years, self.results)
+        self._redraw(self._features_canvas, self._features_axes, new_figure)
+    
+    def _update_bands(self, bands, lines, years, series):
+        """Shade mean ± std around each line after a batch run; single runs get no bands"""
+        self._clear_bands(bands)
+        if self.results_std is None:
+            return
+        for key, line in lines.items():
+            mean, std = series[key], self.results_std[key]
+            bands[key] = line.axes.fill_between(years, mean - std, mean + std, color=line.get_color(),
+                                                alpha=0.2, linewidth=0)
+    
+    def _clear_bands(self, bands):
+        """Remove the mean ± std bands of a previous batch run"""
+        for band in bands.values():
+            band.remove()
+        bands.clear()
+    
+    def _redraw(self, canvas, axes, new_figure):
+        """Rescale axes to their updated lines and schedule a redraw of the canvas"""
+        for ax in axes:
+            ax.relim()
+            ax.autoscale_view()
+        if new_figure:
+            canvas.figure.tight_layout()
+        canvas.draw_idle()
     
     def show_statistics(self, parent):
         """Show summary statistics"""
         
         # Create scrollable text widget
-        text_frame = ttk.Frame(parent)
-        text_frame.pack(fill="both", expand=True)
-        
-        text = tk.Text(text_frame, wrap="word", font=("Courier", 10))
-        scrollbar = ttk.Scrollbar(text_frame, command=text.yview)
-        text.configure(yscrollcommand=scrollbar.set)
-        
-        text.pack(side="left", fill="both", expand=True)
-        scrollbar.pack(side="right", fill="y")
+        if self._stats_text is None:
+            text_frame = ttk.Frame(parent)
+            text_frame.pack(fill="both", expand=True)
+            
+            self._stats_text = tk.Text(text_frame, wrap="word", font=("Courier", 10))
+            scrollbar = ttk.Scrollbar(text_frame, command=self._stats_text.yview)
+            self._stats_text.configure(yscrollcommand=scrollbar.set)
+            
+            self._stats_text.pack(side="left", fill="both", expand=True)
+            scrollbar.pack(side="right", fill="y")
         
         # Calculate statistics
-        initial_locals = self.results["total_locals"][0]
-        final_locals = self.results["total_locals"][-1]
-        initial_migrants = self.results["total_migrants"][0]
-        final_migrants = self.results["total_migrants"][-1]
-        
-        initial_vocab = self.results["mean_local_vocab"][0]
-        final_vocab = self.results["mean_local_vocab"][-1]
-        initial_grammar = self.results["mean_local_grammar"][0]
-        final_grammar = self.results["mean_local_grammar"][-1]
-        initial_phonetics = self.results["mean_local_phonetics"][0]
-        final_phonetics = self.results["mean_local_phonetics"][-1]
-        initial_pronouns = self.results["mean_local_pronouns"][0]
-        final_pronouns = self.results["mean_local_pronouns"][-1]
+        locals_series = self.results["total_locals"]
+        migrants_series = self.results["total_migrants"]
+        initial_locals = int(locals_series[0])
+        final_locals = int(locals_series[-1])
+        initial_migrants = int(migrants_series[0])
+        final_migrants = int(migrants_series[-1])
+        peak_step = int(migrants_series.argmax())
+        peak_migrants = int(migrants_series[peak_step])
+        peak_year = self.results["tick"][peak_step] / 12
+        
+        initial_vocab = float(self.results["mean_local_vocab"][0])
+        final_vocab = float(self.results["mean_local_vocab"][-1])
+        initial_grammar = float(self.results["mean_local_grammar"][0])
+        final_grammar = float(self.results["mean_local_grammar"][-1])
+        initial_phonetics = float(self.results["mean_local_phonetics"][0])
+        final_phonetics = float(self.results["mean_local_phonetics"][-1])
+        initial_pronouns = float(self.results["mean_local_pronouns"][0])
+        final_pronouns = float(self.results["mean_local_pronouns"][-1])
         
         # Format statistics
         stats_text = f"""
@@ -473,6 +922,9 @@ Final Population:
   Migrants:  {final_migrants:,} ({(final_migrants-initial_migrants)/initial_migrants*100:+.1f}%)
   Total:     {final_locals + final_migrants:,}
 
+Peak Migrants:
+  Count:     {peak_migrants:,} (year {peak_year:.1f})
+
 Migrant Proportion:
   Initial:   {initial_migrants/(initial_locals+initial_migrants)*100:.1f}%
   Final:     {final_migrants/(final_locals+final_migrants)*100:.1f}%
@@ -512,6 +964,10 @@ Duration:              {len(self.results["tick"])/12:.1f} years
 Time Steps:            {len(self.results["tick"])} months
 """
         
+        # Replace the previous run's text
+        text = self._stats_text
+        text.config(state="normal")
+        text.delete("1.0", tk.END)
         text.insert("1.0", stats_text)
         text.config(state="disabled")
     
@@ -529,15 +985,74 @@ Time Steps:            {len(self.results["tick"])} months
         )
         
         if filename:
-            try:
-                export_data_to_csv(self.results, filename)
-                messagebox.showinfo("Export Successful", f"Data exported to:\n{filename}")
-            except Exception as e:
-                messagebox.showerror("Export Error", f"Failed to export data:\n{str(e)}")
+            # Write the file in the background so the window stays responsive
+            self.export_button.config(state="disabled")
+            self.update_status("Exporting data...", "orange")
+            thread = threading.Thread(target=self._export_worker, args=(self.results, filename))
+            thread.daemon = True
+            thread.start()
+    
+    def _export_worker(self, results, filename):
+        """Export results to CSV in a background thread"""
+        from visualization import export_data_to_csv
+        
+        try:
+            export_data_to_csv(results, filename)
+        except Exception as e:
+            self.root.after(0, self._export_finished, filename, str(e))
+        else:
+            self.root.after(0, self._export_finished, filename, None)
+    
+    def _export_finished(self, filename, error):
+        """Report the outcome of a background export"""
+        self.export_button.config(state="normal")
+        if error is None:
+            self.update_status("Export complete", "green")
+            messagebox.showinfo("Export Successful", f"Data exported to:\n{filename}")
+        else:
+            self.update_status("Export failed", "red")
+            messagebox.showerror("Export Error", f"Failed to export data:\n{error}")
 
 
 def main():
     """Main entry point"""
+    parser = argparse.ArgumentParser(description="Brazilian-Portuguese Migration ABM")
+    parser.add_argument("--headless", action="store_true",
+                        help="run without the GUI and write the results to CSV")
+    parser.add_argument("--output", default="simulation_results.csv",
+                        help="CSV file written by --headless (default: %(default)s)")
+    parser.add_argument("--seed", type=int, help="random seed for --headless runs")
+    for key, value in DEFAULT_PARAMETERS.items():
+        if key == "num_runs":
+            continue
+        parser.add_argument("--" + key.replace("_", "-"), type=type(value), default=value,
+                            help="default: %(default)s")
+    parser.add_argument("--num-runs", type=int, default=1,
+                        help="independent --headless runs in parallel, each with its own seed and "
+                             "written to OUTPUT with a _run<N> suffix when more than one (default: %(default)s)")
+    args = parser.parse_args()
+    
+    if args.headless:
+        if args.num_runs < 1:
+            parser.error("--num-runs must be at least 1")
+        params = {key: getattr(args, key) for key in DEFAULT_PARAMETERS if key != "num_runs"}
+        simulation_years = params.pop("simulation_years")
+        if args.num_runs == 1:
+            if args.seed is not None:
+                params["seed"] = args.seed
+            run_headless(params, simulation_years, args.output)
+            return
+        
+        from model import run_many
+        from visualization import export_data_to_csv
+        
+        # Seeds of the runs derive from --seed, so a seeded batch is reproducible
+        seeds = [int(seed) for seed in np.random.default_rng(args.seed).integers(0, 2**32, args.num_runs)]
+        stem, ext = os.path.splitext(args.output)
+        for index, results in enumerate(run_many(params, simulation_years * 12, seeds), 1):
+            export_data_to_csv(results, f"{stem}_run{index}{ext}")
+        return
+    
     root = tk.Tk()
     app = MigrationModelGUI(root)
     root.mainloop()
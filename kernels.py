@@ -0,0 +1,220 @@
+"""
+Numerical kernels for the migration simulation.
+Operate directly on the Population column arrays and are compiled with
+Numba when it is installed; otherwise they run as plain Python.
+
+Compiled kernels are cached on disk (in __pycache__), so only the first run
+after installing or editing this module pays the compilation cost.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+    HAVE_NUMBA = True
+except ImportError:  # Numba is optional
+    HAVE_NUMBA = False
+    
+    def njit(*args, **kwargs):
+        """Fallback decorator that leaves the function uncompiled."""
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+    
+    prange = range
+
+
+# Compile options shared by every kernel. Indices come from the Population and
+# are always in range, so bounds checks stay off even if NUMBA_BOUNDSCHECK is set.
+_JIT_OPTIONS = {"cache": True, "boundscheck": False}
+
+
+# Strength of the locals' reverse effect on migrants
+REVERSE_RATE = 0.1
+
+
+def direction_rates(rates):
+    """
+    Build the per-direction influence table used by `interact_batch`.
+    
+    Rows are indexed by `[role, direction]`: role 0 is the initiator acting on
+    its partner and role 1 the partner acting back; direction is
+    `(source is a revealing migrant) << 1 | (target is a migrant)`, so only
+    revealing migrants influence locals and only initiating locals pull
+    migrants back.
+    
+    Args:
+        rates: Influence rates for vocab, grammar, phonetics, pronouns
+    
+    Returns:
+        float32 array of shape (2, 4, len(rates))
+    """
+    table = np.zeros((2, 4, len(rates)), dtype=np.float32)
+    table[:, 2] = rates
+    table[0, 1] = -REVERSE_RATE * np.asarray(rates, dtype=np.float32)
+    return table
+
+
+@njit(**_JIT_OPTIONS)
+def _direction(source, target, is_mig, reveals):
+    """Row of the direction table for `source` acting on `target`."""
+    # A migrant who hides their identity has no effect in either role
+    return (2 * is_mig[source] + is_mig[target]) * (reveals[source] or not is_mig[source])
+
+
+@njit(fastmath=True, **_JIT_OPTIONS)
+def _shift_features(target, amount, features, rates):
+    """Move one agent's feature row by `amount * rates`, clamped to 0-100."""
+    row = features[target]
+    for f in range(row.shape[0]):
+        row[f] = min(100.0, max(0.0, row[f] + rates[f] * amount))
+
+
+@njit(fastmath=True, parallel=True, **_JIT_OPTIONS)
+def interact_batch(indptr, i_idx, j_idx, features, is_mig, reveals, freq, table):
+    """
+    Apply a batch of linguistic interactions, split into independent groups.
+    
+    Pairs within a group may share agents and are applied in order; groups
+    must not share agents (e.g. one group per district), so they run in parallel.
+    
+    Args:
+        indptr: Group boundaries: group g holds pairs indptr[g] to indptr[g + 1]
+        i_idx: Slots of the agents starting each interaction
+        j_idx: Slots of their partners
+        features: (N, 4) feature matrix, updated in place
+        is_mig: Migrant flag column
+        reveals: Reveal-identity flag column
+        freq: Interaction frequency column
+        table: Direction table from `direction_rates`
+    """
+    for g in prange(len(indptr) - 1):
+        for k in range(indptr[g], indptr[g + 1]):
+            i = i_idx[k]
+            j = j_idx[k]
+            
+            # Each side shifts the other by a table row; rows without influence are zero
+            _shift_features(j, freq[i], features, table[0, _direction(i, j, is_mig, reveals)])
+            _shift_features(i, freq[j], features, table[1, _direction(j, i, is_mig, reveals)])
+
+
+def interact_batch_numpy(i_idx, j_idx, features, is_mig, reveals, freq, table):
+    """
+    Vectorized form of `interact_batch` for runs without Numba.
+    
+    Gathers both directions' table rows for every pair, scales them by the
+    acting agent's frequency and scatters the sums back with `np.add.at`.
+    Unlike the compiled kernel, every pair sees the features as they were
+    before the batch and clamping to 0-100 happens once at the end, which
+    only differs when several interactions push an agent past a bound.
+    
+    Args:
+        i_idx, j_idx, features, is_mig, reveals, freq, table: As for
+            `interact_batch`, without group boundaries
+    """
+    def directions(source, target):
+        source_mig = is_mig[source]
+        return (2 * source_mig + is_mig[target]) * (reveals[source] | ~source_mig)
+    
+    np.add.at(features, j_idx, table[0, directions(i_idx, j_idx)] * freq[i_idx, None])
+    np.add.at(features, i_idx, table[1, directions(j_idx, i_idx)] * freq[j_idx, None])
+    
+    touched = np.concatenate((i_idx, j_idx))
+    features[touched] = np.clip(features[touched], 0.0, 100.0)
+
+
+@njit(**_JIT_OPTIONS)
+def splitmix64(x):
+    """
+    SplitMix64 hash of uint64 counters (scalars or arrays).
+    
+    Hashing (seed, agent, step) counters gives reproducible random numbers
+    without carrying generator state through the kernels.
+    """
+    x = x + np.uint64(0x9E3779B97F4A7C15)
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+@njit(**_JIT_OPTIONS)
+def counter_uniform(agent_id, step, seed):
+    """
+    Uniform [0, 1) draws keyed by agent ID, time step and seed.
+    
+    Args:
+        agent_id: Array of agent IDs
+        step: Current time step
+        seed: Non-negative integer seed of the run
+    
+    Returns:
+        float64 array with one draw per agent
+    """
+    key = agent_id.astype(np.uint64) ^ (np.uint64(step) << np.uint64(32)) ^ np.uint64(seed)
+    return (splitmix64(key) >> np.uint64(11)).astype(np.float64) * (1.0 / 9007199254740992.0)
+
+
+@njit(fastmath=True, parallel=True, **_JIT_OPTIONS)
+def step_kernel(features, media_exposure, age, alive, is_mig, district_id, media_scale,
+                media_weights, annual, draws, death_rate_lut):
+    """
+    Apply the per-agent updates of one month in a single pass.
+    
+    Every living local gets this month's media influence; on annual steps
+    every living agent also ages one year and is tested for mortality.
+    Agents are independent here, so the loop runs in parallel.
+    
+    Args:
+        features, media_exposure, age, alive, is_mig, district_id: Population
+            columns for the occupied slots (features and age updated in place)
+        media_scale: Media influence per unit of exposure, indexed by district ID
+        media_weights: Relative media effect on vocab, grammar, phonetics, pronouns
+        annual: Whether this step also ages agents and applies mortality
+        draws: Uniform [0, 1) draw per agent, used on annual steps
+        death_rate_lut: Annual death rate indexed by age (older ages use the last entry)
+    
+    Returns:
+        Boolean mask of the agents that die
+    """
+    n = len(age)
+    dies = np.zeros(n, dtype=np.bool_)
+    last_age = len(death_rate_lut) - 1
+    for i in prange(n):
+        if not alive[i]:
+            continue
+        
+        # Media only shifts locals
+        if not is_mig[i]:
+            total = media_exposure[i] * media_scale[district_id[i]]
+            for f in range(features.shape[1]):
+                features[i, f] = min(100.0, max(0.0, features[i, f] + total * media_weights[f]))
+        
+        if annual:
+            age[i] += 1
+            dies[i] = draws[i] < death_rate_lut[min(age[i], last_age)]
+    return dies
+
+
+def step_numpy(features, media_exposure, age, alive, is_mig, district_id, media_scale,
+               media_weights, annual, draws, death_rate_lut):
+    """
+    Vectorized form of `step_kernel` for runs without Numba.
+    
+    Args:
+        features, media_exposure, age, alive, is_mig, district_id, media_scale,
+            media_weights, annual, draws, death_rate_lut: As for `step_kernel`
+    
+    Returns:
+        Boolean mask of the agents that die
+    """
+    locals_ = np.flatnonzero(alive & ~is_mig)
+    total = media_exposure[locals_] * media_scale[district_id[locals_]]
+    updated = np.multiply(total[:, None], media_weights)
+    updated += features[locals_]
+    features[locals_] = np.clip(updated, 0.0, 100.0, out=updated)
+    
+    if not annual:
+        return np.zeros(len(age), dtype=np.bool_)
+    age[alive] += 1
+    rates = death_rate_lut[np.minimum(age, len(death_rate_lut) - 1)]
+    return alive & (draws < rates)
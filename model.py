@@ -3,10 +3,60 @@ Main simulation model for Brazilian Migration to Portugal.
 Implements the agent-based model with demographic and linguistic dynamics.
 """
 
-import random
+import multiprocessing
 from collections import defaultdict
-from agents import LocalAgent, MigrantAgent, Sex
-from districts import create_portugal_districts, select_migration_district
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+import numpy as np
+
+from agents import FEMALE, Population
+from districts import create_portugal_districts, district_arrays, select_migration_districts
+from kernels import direction_rates
+
+# Simplified age distribution of locals: probability, youngest and oldest age per band
+_AGE_BAND_PROBS = np.array([0.15, 0.10, 0.20, 0.20, 0.35])
+_AGE_BAND_MIN = np.array([0, 15, 25, 45, 65])
+_AGE_BAND_MAX = np.array([14, 24, 44, 64, 90])
+_AGE_BAND_CDF = np.cumsum(_AGE_BAND_PROBS)
+
+
+# Age buckets of the contact groups: children and teens meet at school, working ages at work
+_AGE_BUCKET_EDGES = np.array([5, 18, 67])
+_STUDENT_BUCKET, _WORKER_BUCKET = 1, 2
+
+
+def _group_layout(members, keys):
+    """
+    Describe runs of equal keys as groups (CSR-style).
+    
+    Args:
+        members: Population slots, sorted so that equal keys are adjacent
+        keys: Group key (e.g. district ID) of each member
+    
+    Returns:
+        Tuple (members, start, size): the slots, and for each of them the
+        position where its group starts and the group's size
+    """
+    starts = np.flatnonzero(np.diff(keys, prepend=np.int64(-1)))
+    sizes = np.diff(np.append(starts, len(members)))
+    return members, np.repeat(starts, sizes), np.repeat(sizes, sizes)
+
+
+# Collected series and their storage types
+_HISTORY_SERIES = (
+    ("tick", np.int32),
+    ("total_locals", np.int32),
+    ("total_migrants", np.int32),
+    ("mean_local_vocab", np.float32),
+    ("mean_local_grammar", np.float32),
+    ("mean_local_phonetics", np.float32),
+    ("mean_local_pronouns", np.float32),
+    ("mean_migrant_vocab", np.float32),
+    ("mean_migrant_grammar", np.float32),
+    ("mean_migrant_phonetics", np.float32),
+    ("mean_migrant_pronouns", np.float32),
+)
 
 
 class MigrationModel:
@@ -23,26 +73,37 @@ class MigrationModel:
         self.tick = 0  # 1 tick = 1 month
         self.next_agent_id = 1
         
-        # Create districts
-        self.districts = create_portugal_districts()
-        
-        # Agent storage
-        self.agents = []
-        
-        # Data collection
-        self.data_collector = {
-            "tick": [],
-            "total_locals": [],
-            "total_migrants": [],
-            "mean_local_vocab": [],
-            "mean_local_grammar": [],
-            "mean_local_phonetics": [],
-            "mean_local_pronouns": [],
-            "mean_migrant_vocab": [],
-            "mean_migrant_grammar": [],
-            "mean_migrant_phonetics": [],
-            "mean_migrant_pronouns": [],
-        }
+        # Shared random generator (set "seed" in params for reproducible runs)
+        self.rng = np.random.default_rng(params.get("seed"))
+        
+        # Seed for the counter-based random numbers drawn inside kernels
+        self.kernel_seed = int(self.rng.integers(0, 2**63))
+        
+        # Initial population size, used as a capacity hint for agent storage
+        expected_population = params.get("number_locals", 1000) + params.get("number_migrants", 100)
+        
+        # Create districts, with room for twice an even share of the initial population
+        self.districts = create_portugal_districts(self.rng)
+        for district in self.districts.values():
+            district.reserve(2 * expected_population // len(self.districts))
+        self.district_ids, self.district_attractiveness, self._district_density = \
+            district_arrays(self.districts)
+        self._district_density_dirty = False
+        
+        # Cumulative attractiveness for weighted district draws (attractiveness never changes)
+        self._district_cum = np.cumsum(self.district_attractiveness, dtype=np.float64)
+        
+        # Media infrastructure per district, in the order of district_ids
+        self.district_media = np.array([d.media_infrastructure for d in self.districts.values()],
+                                       dtype=np.float32)
+        
+        # Agent storage (Struct-of-Arrays, one column per attribute)
+        self.population = Population(self, capacity=max(1024, 2 * expected_population))
+        
+        # Data collection: one preallocated array per series, filled up to _history_len
+        # (run() reserves its steps; stepping past the end doubles the arrays)
+        self._history = {key: np.zeros(240, dtype=dtype) for key, dtype in _HISTORY_SERIES}
+        self._history_len = 0
         
         # Death rates by age (age_range: annual_death_rate)
         self.death_rates = {
@@ -59,6 +120,11 @@ class MigrationModel:
             (85, 120): 0.15,
         }
         
+        # Same rates as a lookup table indexed by age (ages above 127 use the last entry)
+        self.death_rate_lut = np.full(128, 0.001, dtype=np.float32)  # Default very low rate
+        for (age_min, age_max), rate in self.death_rates.items():
+            self.death_rate_lut[age_min:age_max] = rate
+        
         # Birth rates (annual probability for women in fertile age)
         self.birth_rate_locals = params.get("local_birth_rate", 0.04)
         self.birth_rate_migrants = params.get("migrant_birth_rate", 0.06)
@@ -75,6 +141,12 @@ class MigrationModel:
             "pronouns": params.get("pronoun_influence_rate", 0.25),
             "phonetics": params.get("phonetic_influence_rate", 0.15),
         }
+        self.direction_rates = direction_rates([
+            self.influence_rates["vocab"],
+            self.influence_rates["grammar"],
+            self.influence_rates["phonetics"],
+            self.influence_rates["pronouns"],
+        ])
     
     def setup(self):
         """Initialize the model with starting populations."""
@@ -93,58 +165,61 @@ class MigrationModel:
     
     def _create_initial_locals(self, num_locals):
         """Create initial local population with realistic age distribution."""
-        for _ in range(num_locals):
-            # Age distribution (simplified - could use real demographic data)
-            age = self._generate_age_from_distribution()
-            sex = random.choice([Sex.MALE, Sex.FEMALE])
-            
-            # Distribute across districts (weighted by economic attractiveness)
-            district_id = self._select_district_weighted()
-            
-            agent = LocalAgent(self.next_agent_id, age, sex, district_id, self)
-            self.next_agent_id += 1
-            
-            self.agents.append(agent)
-            self.districts[district_id].add_agent(agent)
+        # Age distribution (simplified - could use real demographic data)
+        ages = self._generate_ages(num_locals)
+        sexes = self.rng.integers(0, 2, num_locals)
+        
+        # Distribute across districts (weighted by economic attractiveness)
+        district_ids = self._select_districts_weighted(num_locals)
+        
+        self._add_to_districts(self.population.spawn_locals(ages, sexes, district_ids))
     
     def _create_initial_migrants(self, num_migrants):
         """Create initial migrant population."""
-        for _ in range(num_migrants):
-            # Migrants tend to be younger
-            age = random.randint(18, 45)
-            sex = random.choice([Sex.MALE, Sex.FEMALE])
-            
-            # Migrants prefer economic centers or existing communities
-            strategy = random.choice(["economic", "ethnic"])
-            district_id = select_migration_district(self.districts, strategy)
-            
-            agent = MigrantAgent(self.next_agent_id, age, sex, district_id, self)
-            self.next_agent_id += 1
-            
-            self.agents.append(agent)
-            self.districts[district_id].add_agent(agent)
+        # Migrants tend to be younger
+        ages = self.rng.integers(18, 46, num_migrants)
+        sexes = self.rng.integers(0, 2, num_migrants)
+        
+        # Migrants prefer economic centers or existing communities
+        strategies = self.rng.choice(["economic", "ethnic"], num_migrants)
+        district_ids = self._select_migration_districts(strategies)
+        
+        self._add_to_districts(self.population.spawn_migrants(ages, sexes, district_ids))
+    
+    @property
+    def district_density(self):
+        """Brazilian speaker density per district, rebuilt only after membership changes."""
+        if self._district_density_dirty:
+            for k, district in enumerate(self.districts.values()):
+                self._district_density[k] = district.density
+            self._district_density_dirty = False
+        return self._district_density
+    
+    def _select_migration_districts(self, strategies):
+        """Select settlement districts for a batch of migrants from current district state."""
+        return select_migration_districts(self.district_ids, self.district_attractiveness,
+                                          self.district_density, strategies, self.rng)
     
-    def _generate_age_from_distribution(self):
-        """Generate age from a realistic distribution."""
-        # Simplified age distribution
-        rand = random.random()
-        if rand < 0.15:
-            return random.randint(0, 14)
-        elif rand < 0.25:
-            return random.randint(15, 24)
-        elif rand < 0.45:
-            return random.randint(25, 44)
-        elif rand < 0.65:
-            return random.randint(45, 64)
-        else:
-            return random.randint(65, 90)
+    def _add_to_districts(self, slots):
+        """Register newly spawned agents with their districts."""
+        pop = self.population
+        indices = np.arange(slots.start, slots.stop, dtype=np.int32)
+        for district_id in np.unique(pop.district_id[indices]):
+            members = indices[pop.district_id[indices] == district_id]
+            self.districts[int(district_id)].add_agents(pop, members)
+        self._district_density_dirty = True
     
-    def _select_district_weighted(self):
-        """Select district weighted by economic attractiveness."""
-        districts_list = list(self.districts.values())
-        weights = [d.economic_attractiveness for d in districts_list]
-        selected = random.choices(districts_list, weights=weights, k=1)[0]
-        return selected.district_id
+    def _generate_ages(self, n):
+        """Generate `n` ages from a realistic distribution."""
+        # Pick an age band for each agent by inverting the band CDF, then a uniform age within it
+        bands = np.searchsorted(_AGE_BAND_CDF, self.rng.random(n) * _AGE_BAND_CDF[-1], side="right")
+        return self.rng.integers(_AGE_BAND_MIN[bands], _AGE_BAND_MAX[bands] + 1)
+    
+    def _select_districts_weighted(self, n):
+        """Select `n` districts weighted by economic attractiveness."""
+        # Invert the cached cumulative weights with one binary search per draw
+        targets = self.rng.random(n) * self._district_cum[-1]
+        return self.district_ids[np.searchsorted(self._district_cum, targets, side="right")]
     
     def step(self):
         """Execute one time step (1 month) of the simulation."""
@@ -153,175 +228,225 @@ class MigrationModel:
         # Monthly processes
         self._process_immigration()
         self._process_social_interactions()
-        self._process_media_exposure()
+        
+        # Media exposure, plus aging and mortality every 12 ticks, in one pass over the agents
+        annual = self.tick % 12 == 0
+        dies = self._process_agent_updates(annual)
         
         # Annual processes (every 12 ticks)
-        if self.tick % 12 == 0:
-            self._process_annual_demographics()
+        if annual:
+            self._process_annual_demographics(dies)
         
         # Update district properties
-        for district in self.districts.values():
-            district.update_media_infrastructure()
+        self.update_all_media_infrastructure()
         
         # Collect data
         self._collect_data()
     
+    def update_all_media_infrastructure(self):
+        """Move every district's media infrastructure by a small random walk step."""
+        change = self.rng.uniform(-2, 2, len(self.district_media)).astype(np.float32)
+        np.clip(self.district_media + change, 0, 100, out=self.district_media)
+    
     def _process_immigration(self):
         """Process monthly immigration of Brazilians."""
         annual_inflow = self.params.get("annual_br_inflow", 120)
         monthly_inflow = int(annual_inflow / 12)
         
-        for _ in range(monthly_inflow):
-            age = random.randint(18, 45)  # Working age migrants
-            sex = random.choice([Sex.MALE, Sex.FEMALE])
-            
-            # Choose settlement location
-            strategy = random.choice(["economic", "economic", "ethnic"])  # 2/3 economic
-            district_id = select_migration_district(self.districts, strategy)
-            
-            agent = MigrantAgent(self.next_agent_id, age, sex, district_id, self)
-            self.next_agent_id += 1
-            
-            self.agents.append(agent)
-            self.districts[district_id].add_agent(agent)
+        ages = self.rng.integers(18, 46, monthly_inflow)  # Working age migrants
+        sexes = self.rng.integers(0, 2, monthly_inflow)
+        
+        # Choose settlement locations for the whole batch at once
+        strategies = self.rng.choice(["economic", "economic", "ethnic"], monthly_inflow)  # 2/3 economic
+        district_ids = self._select_migration_districts(strategies)
+        
+        self._add_to_districts(self.population.spawn_migrants(ages, sexes, district_ids))
     
     def _process_social_interactions(self):
         """Process social interactions within each district."""
-        for district in self.districts.values():
-            if len(district.agents) < 2:
-                continue
-            
-            # School interactions (children and teens)
-            students = district.get_agents_by_age_range(5, 18)
-            for student in students:
-                if not student.alive:
-                    continue
-                for _ in range(self.num_school_interactions):
-                    if len(students) > 1:
-                        other = random.choice([s for s in students if s != student and s.alive])
-                        student.interact_linguistically(other, self.influence_rates)
-            
-            # Workplace interactions (working age)
-            workers = district.get_agents_by_age_range(18, 67)
-            for worker in workers:
-                if not worker.alive:
-                    continue
-                for _ in range(self.num_workplace_interactions):
-                    if len(workers) > 1:
-                        other = random.choice([w for w in workers if w != worker and w.alive])
-                        worker.interact_linguistically(other, self.influence_rates)
-            
-            # Market/public space interactions (random)
-            for agent in district.agents:
-                if not agent.alive:
-                    continue
-                if random.random() < self.prob_interaction_market:
-                    if len(district.agents) > 1:
-                        other = random.choice([a for a in district.agents if a != agent and a.alive])
-                        agent.interact_linguistically(other, self.influence_rates)
+        i_idx, j_idx = self.sample_contacts()
+        
+        # Apply every sampled interaction in one compiled pass
+        self.population.interact(i_idx, j_idx, self.direction_rates)
     
-    def _process_media_exposure(self):
-        """Apply media influence to all agents."""
+    def sample_contacts(self):
+        """
+        Sample this month's interaction pairs in every district.
+        
+        Returns:
+            Tuple (i_idx, j_idx) of population slots of the agents starting
+            each interaction and of their partners
+        """
+        pop = self.population
+        
+        # Living agents ordered by district (already nearly sorted after the annual regroup)
+        alive = np.flatnonzero(pop.alive[:pop.n])
+        residents = alive[np.argsort(pop.district_id[alive], kind="stable")]
+        district = pop.district_id[residents]
+        bucket = np.digitize(pop.age[residents], _AGE_BUCKET_EDGES)
+        
+        # Partners for every district are drawn together, one batch per kind of contact
+        pairs = []
+        for age_bucket, repeats in ((_STUDENT_BUCKET, self.num_school_interactions),
+                                    (_WORKER_BUCKET, self.num_workplace_interactions)):
+            in_bucket = bucket == age_bucket
+            members, start, size = _group_layout(residents[in_bucket], district[in_bucket])
+            initiators = np.repeat(np.arange(len(members)), repeats)
+            pairs.append(self._sample_partners(members, start, size, initiators))
+        
+        # Market/public space interactions (random)
+        members, start, size = _group_layout(residents, district)
+        initiators = np.flatnonzero(self.rng.random(len(members)) < self.prob_interaction_market)
+        pairs.append(self._sample_partners(members, start, size, initiators))
+        
+        return np.concatenate([i for i, _ in pairs]), np.concatenate([j for _, j in pairs])
+    
+    def _sample_partners(self, members, start, size, initiators):
+        """
+        Draw a uniformly random partner for each initiator from its own group.
+        
+        Args:
+            members: Population slots of the agents of every group, group after group
+            start, size: Position in `members` where each agent's group starts, and its size
+            initiators: Positions in `members` of the agents starting an interaction
+        
+        Returns:
+            Tuple (i_idx, j_idx) of population slots of the initiators and their partners
+        """
+        # Agents alone in their group have nobody to meet
+        initiators = initiators[size[initiators] >= 2]
+        start = start[initiators]
+        
+        # Draw among the other n-1 members of the group, then skip over the initiator
+        partners = self.rng.integers(0, size[initiators] - 1)
+        partners += partners >= initiators - start
+        return members[initiators], members[start + partners]
+    
+    def _process_agent_updates(self, annual):
+        """
+        Apply media influence to all agents, and aging and mortality on annual steps.
+        
+        Args:
+            annual: Whether this is an annual step
+        
+        Returns:
+            Boolean mask over the population slots of the agents that die
+        """
         base_media = self.params.get("base_media_influence", 0.5)
         
-        for agent in self.agents:
-            if not agent.alive:
-                continue
-            district = self.districts[agent.district_id]
-            agent.apply_media_influence(base_media, district.media_infrastructure)
+        # Media influence per unit of exposure in each district
+        media_scale = np.zeros(int(self.district_ids.max()) + 1, dtype=np.float32)
+        media_scale[self.district_ids] = self.district_media / 10000.0 * base_media
+        
+        # Years in Portugal follow from age - arrival_age, so aging only touches age
+        return self.population.step_agents(media_scale, annual, self.tick, self.kernel_seed,
+                                           self.death_rate_lut)
     
-    def _process_annual_demographics(self):
-        """Process annual demographic changes: aging, births, deaths."""
-        # Aging
-        for agent in self.agents:
-            if agent.alive:
-                agent.age_one_year()
-        
-        # Deaths
-        agents_to_remove = []
-        for agent in self.agents:
-            if agent.alive and agent.check_mortality(self.death_rates):
-                self.districts[agent.district_id].remove_agent(agent)
-                agents_to_remove.append(agent)
-        
-        for agent in agents_to_remove:
-            self.agents.remove(agent)
+    def _process_annual_demographics(self, dies):
+        """
+        Process annual demographic changes: births, deaths.
+        
+        Args:
+            dies: Mask of the agents that died this year, from `_process_agent_updates`
+        """
+        pop = self.population
+        
+        # Deaths (dead agents keep their slot with alive=False until regrouping)
+        dead = np.flatnonzero(dies)
+        pop.alive[dead] = False
+        dead_district_ids = pop.district_id[dead]
+        for district_id in np.unique(dead_district_ids):
+            self.districts[int(district_id)].remove_agents(pop, dead[dead_district_ids == district_id])
+        self._district_density_dirty = True
         
         # Births
         self._process_births()
+        
+        # Regroup living agents by district so district-level passes read contiguous memory
+        self._regroup_population()
+    
+    def _regroup_population(self):
+        """Compact the population into per-district contiguous slot ranges."""
+        pop = self.population
+        district_id = pop.sort_by_district()
+        for district in self.districts.values():
+            start = np.searchsorted(district_id, district.district_id, side="left")
+            end = np.searchsorted(district_id, district.district_id, side="right")
+            district.set_members(pop, np.arange(start, end, dtype=np.int32))
     
     def _process_births(self):
         """Process births for fertile women."""
         fertile_age_min = 18
         fertile_age_max = 45
         
-        for agent in self.agents:
-            if not agent.alive:
+        pop = self.population
+        n = pop.n
+        age = pop.age[:n]
+        fertile = pop.alive[:n] & (pop.sex[:n] == FEMALE) & (age >= fertile_age_min) & (age < fertile_age_max)
+        mothers = np.flatnonzero(fertile)
+        
+        # Birth rate based on agent type, read from the migrant flag column
+        birth_rates = np.where(pop.is_migrant[mothers], self.birth_rate_migrants, self.birth_rate_locals)
+        
+        births = mothers[self.rng.random(len(mothers)) < birth_rates]
+        
+        # Create the children of each type in one batch, in their mothers' districts
+        for is_migrant, spawn in ((False, pop.spawn_locals), (True, pop.spawn_migrants)):
+            parents = births[pop.is_migrant[births] == is_migrant]
+            if len(parents) == 0:
                 continue
+            num_children = len(parents)
+            slots = spawn(np.zeros(num_children), self.rng.integers(0, 2, num_children),
+                          pop.district_id[parents])
             
-            if agent.sex == Sex.FEMALE and fertile_age_min <= agent.age < fertile_age_max:
-                # Determine birth rate based on agent type
-                if isinstance(agent, LocalAgent):
-                    birth_rate = self.birth_rate_locals
-                else:
-                    birth_rate = self.birth_rate_migrants
-                
-                if random.random() < birth_rate:
-                    # Create a child
-                    child_sex = random.choice([Sex.MALE, Sex.FEMALE])
-                    
-                    if isinstance(agent, LocalAgent):
-                        child = LocalAgent(self.next_agent_id, 0, child_sex, agent.district_id, self)
-                    else:
-                        child = MigrantAgent(self.next_agent_id, 0, child_sex, agent.district_id, self)
-                    
-                    # Inherit linguistic features from mother
-                    child.inherit_features_from_parent(agent)
-                    
-                    self.next_agent_id += 1
-                    self.agents.append(child)
-                    self.districts[agent.district_id].add_agent(child)
+            # Inherit linguistic features from mother
+            pop.inherit_features(np.arange(slots.start, slots.stop), parents)
+            
+            self._add_to_districts(slots)
     
     def _collect_data(self):
         """Collect data for analysis."""
-        locals_list = [a for a in self.agents if isinstance(a, LocalAgent) and a.alive]
-        migrants_list = [a for a in self.agents if isinstance(a, MigrantAgent) and a.alive]
-        
-        self.data_collector["tick"].append(self.tick)
-        self.data_collector["total_locals"].append(len(locals_list))
-        self.data_collector["total_migrants"].append(len(migrants_list))
-        
-        # Mean linguistic features for locals
-        if locals_list:
-            self.data_collector["mean_local_vocab"].append(
-                sum(a.brazilian_vocab for a in locals_list) / len(locals_list))
-            self.data_collector["mean_local_grammar"].append(
-                sum(a.brazilian_grammar for a in locals_list) / len(locals_list))
-            self.data_collector["mean_local_phonetics"].append(
-                sum(a.brazilian_phonetics for a in locals_list) / len(locals_list))
-            self.data_collector["mean_local_pronouns"].append(
-                sum(a.brazilian_pronouns for a in locals_list) / len(locals_list))
-        else:
-            self.data_collector["mean_local_vocab"].append(0)
-            self.data_collector["mean_local_grammar"].append(0)
-            self.data_collector["mean_local_phonetics"].append(0)
-            self.data_collector["mean_local_pronouns"].append(0)
-        
-        # Mean linguistic features for migrants
-        if migrants_list:
-            self.data_collector["mean_migrant_vocab"].append(
-                sum(a.brazilian_vocab for a in migrants_list) / len(migrants_list))
-            self.data_collector["mean_migrant_grammar"].append(
-                sum(a.brazilian_grammar for a in migrants_list) / len(migrants_list))
-            self.data_collector["mean_migrant_phonetics"].append(
-                sum(a.brazilian_phonetics for a in migrants_list) / len(migrants_list))
-            self.data_collector["mean_migrant_pronouns"].append(
-                sum(a.brazilian_pronouns for a in migrants_list) / len(migrants_list))
-        else:
-            self.data_collector["mean_migrant_vocab"].append(0)
-            self.data_collector["mean_migrant_grammar"].append(0)
-            self.data_collector["mean_migrant_phonetics"].append(0)
-            self.data_collector["mean_migrant_pronouns"].append(0)
+        pop = self.population
+        n = pop.n
+        
+        # One pass over the alive and migrant columns gives both groups
+        alive = pop.alive[:n]
+        is_migrant = pop.is_migrant[:n]
+        groups = (("local", alive & ~is_migrant), ("migrant", alive & is_migrant))
+        
+        k = self._history_len
+        if k == len(self._history["tick"]):
+            self._reserve_history(2 * k)
+        history = self._history
+        history["tick"][k] = self.tick
+        history["total_locals"][k] = np.count_nonzero(groups[0][1])
+        history["total_migrants"][k] = np.count_nonzero(groups[1][1])
+        
+        # Mean linguistic features per group (0 for an empty group)
+        for group, mask in groups:
+            if mask.any():
+                means = pop.features[:n][mask].mean(axis=0)
+            else:
+                means = (0, 0, 0, 0)
+            vocab, grammar, phonetics, pronouns = means
+            history[f"mean_{group}_vocab"][k] = vocab
+            history[f"mean_{group}_grammar"][k] = grammar
+            history[f"mean_{group}_phonetics"][k] = phonetics
+            history[f"mean_{group}_pronouns"][k] = pronouns
+        self._history_len = k + 1
+    
+    def _reserve_history(self, num_entries):
+        """Grow the history arrays to hold at least `num_entries` steps."""
+        for key, values in self._history.items():
+            if num_entries > len(values):
+                grown = np.zeros(num_entries, dtype=values.dtype)
+                grown[:self._history_len] = values[:self._history_len]
+                self._history[key] = grown
+    
+    @property
+    def data_collector(self):
+        """Collected series so far, as arrays keyed by name."""
+        return {key: values[:self._history_len] for key, values in self._history.items()}
     
     def run(self, num_steps):
         """
@@ -331,6 +456,7 @@ class MigrationModel:
             num_steps: Number of months to simulate
         """
         print(f"Running simulation for {num_steps} months ({num_steps/12:.1f} years)...")
+        self._reserve_history(self._history_len + num_steps)
         
         for step in range(num_steps):
             self.step()
@@ -338,12 +464,66 @@ class MigrationModel:
             # Print progress every year
             if (step + 1) % 12 == 0:
                 year = (step + 1) // 12
-                num_locals = len([a for a in self.agents if isinstance(a, LocalAgent) and a.alive])
-                num_migrants = len([a for a in self.agents if isinstance(a, MigrantAgent) and a.alive])
+                num_locals = self._history["total_locals"][self._history_len - 1]
+                num_migrants = self._history["total_migrants"][self._history_len - 1]
                 print(f"Year {year}: {num_locals} locals, {num_migrants} migrants")
         
         print("Simulation complete!")
     
     def get_results(self):
-        """Return collected data as a dictionary."""
+        """Return collected data as a dictionary of NumPy arrays."""
         return self.data_collector
+
+
+def run_one(params, num_steps, seed=None, progress=None, stop_event=None):
+    """
+    Set up and run a single simulation.
+    
+    Args:
+        params: Dictionary of model parameters
+        num_steps: Number of months to simulate
+        seed: Optional seed overriding params["seed"]
+        progress: Optional shared value (e.g. a `multiprocessing.Manager().Value`)
+            set to the number of completed months, for progress reports from
+            another process
+        stop_event: Optional event (e.g. a `multiprocessing.Event`) checked
+            before every month, which stops the run when set
+    
+    Returns:
+        Collected data as returned by `MigrationModel.get_results`, or None
+        if the run was stopped
+    """
+    if seed is not None:
+        params = dict(params, seed=seed)
+    model = MigrationModel(params)
+    model.setup()
+    if progress is None and stop_event is None:
+        model.run(num_steps)
+    else:
+        for step in range(num_steps):
+            if stop_event is not None and stop_event.is_set():
+                return None
+            model.step()
+            if progress is not None:
+                progress.value = step + 1
+    return model.get_results()
+
+
+def run_many(params, num_steps, seeds, max_workers=None):
+    """
+    Run independent replicates of the same simulation in parallel processes.
+    
+    Args:
+        params: Dictionary of model parameters shared by every replicate
+        num_steps: Number of months to simulate
+        seeds: One seed per replicate
+        max_workers: Number of worker processes (defaults to the CPU count)
+    
+    Returns:
+        List of collected data dictionaries, in the order of `seeds`
+    """
+    # Spawned rather than forked workers: forking a process that has already run
+    # the parallel Numba kernels (e.g. after `run_one`) can deadlock the children
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=context) as executor:
+        return list(executor.map(run_one, repeat(params), repeat(num_steps), seeds))
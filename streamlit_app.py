@@ -4,11 +4,17 @@ Interactive web interface for exploring cultural evolution simulations
 """
 
 import streamlit as st
-import matplotlib.pyplot as plt
-import pandas as pd
+import io
+import multiprocessing
+import os
 import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from matplotlib.figure import Figure
 
-from model import MigrationModel
+from model import run_one
 from visualization import export_data_to_csv
 
 # Page configuration
@@ -26,11 +32,152 @@ Explore how cultural norms evolve through immigration using an agent-based model
 Adjust parameters, run simulations, and visualize results in real-time.
 """)
 
+
+# Seconds between progress checks while a simulation runs in the background
+POLL_INTERVAL = 0.2
+
+
+@st.cache_resource
+def simulation_executor():
+    """Worker processes shared by every session, so simulations never block the UI."""
+    # Spawned, as forked workers can deadlock once a parent has run the parallel kernels
+    return ProcessPoolExecutor(max_workers=os.cpu_count(), mp_context=multiprocessing.get_context("spawn"))
+
+
+@st.cache_resource
+def progress_manager():
+    """Manager process holding the shared progress counters of running simulations."""
+    return multiprocessing.get_context("spawn").Manager()
+
+
+# Derived views of the results, built once per set of results and reused on reruns
+@st.cache_data
+def results_frame(results):
+    """Results as a DataFrame with a year column, built once per set of results."""
+    df = pd.DataFrame(results)
+    df['year'] = df['tick'] / 12
+    return df
+
+
+@st.cache_data
+def results_to_csv(results):
+    """CSV export of the results, serialized once per set of results."""
+    return results_frame(results).to_csv(index=False).encode()
+
+
+# Charts are cached as PNG bytes rather than live figures, so sessions never share
+# a mutable Figure and old parameter sets are evicted instead of leaking figures
+FIGURE_CACHE_ENTRIES = 32
+
+
+def _png(fig):
+    """Render a figure to PNG bytes, at the resolution and margins `st.pyplot` uses."""
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", dpi=200, bbox_inches="tight")
+    return buffer.getvalue()
+
+
+@st.cache_data(max_entries=FIGURE_CACHE_ENTRIES)
+def population_figure(results):
+    """Population sizes over time, as PNG bytes."""
+    fig1 = Figure(figsize=(8, 6))
+    ax1 = fig1.subplots()
+    years = results["tick"] / 12
+    ax1.plot(years, results["total_locals"], label="Locals", color="blue", linewidth=2)
+    ax1.plot(years, results["total_migrants"], label="Migrants", color="red", linewidth=2)
+    ax1.set_xlabel("Year", fontsize=12)
+    ax1.set_ylabel("Population", fontsize=12)
+    ax1.set_title("Population Over Time", fontsize=14, fontweight='bold')
+    ax1.legend(fontsize=10)
+    ax1.grid(True, alpha=0.3)
+    return _png(fig1)
+
+
+@st.cache_data(max_entries=FIGURE_CACHE_ENTRIES)
+def proportion_figure(results):
+    """Migrant share of the population over time, as PNG bytes."""
+    fig2 = Figure(figsize=(8, 6))
+    ax2 = fig2.subplots()
+    years = results["tick"] / 12
+    total_pop = results["total_locals"] + results["total_migrants"]
+    migrant_prop = np.divide(results["total_migrants"] * 100.0, total_pop,
+                             out=np.zeros(len(total_pop)), where=total_pop > 0)
+    ax2.plot(years, migrant_prop, color="purple", linewidth=2)
+    ax2.axhline(y=50, color='gray', linestyle='--', alpha=0.5, label="50% threshold")
+    ax2.set_xlabel("Year", fontsize=12)
+    ax2.set_ylabel("Migrant Proportion (%)", fontsize=12)
+    ax2.set_title("Migrant Proportion Over Time", fontsize=14, fontweight='bold')
+    ax2.legend(fontsize=10)
+    ax2.grid(True, alpha=0.3)
+    return _png(fig2)
+
+
+@st.cache_data(max_entries=FIGURE_CACHE_ENTRIES)
+def features_figure(results):
+    """Locals' and migrants' mean linguistic features, one panel per feature, as PNG bytes."""
+    fig3 = Figure(figsize=(14, 10))
+    (ax1, ax2), (ax3, ax4) = fig3.subplots(2, 2)
+    years = results["tick"] / 12
+    
+    # Vocabulary
+    ax1.plot(years, results["mean_local_vocab"], label="Locals", color="blue", linewidth=2)
+    ax1.plot(years, results["mean_migrant_vocab"], label="Migrants", color="red", linewidth=2)
+    ax1.set_title("Vocabulary", fontsize=12, fontweight='bold')
+    ax1.set_ylabel("Brazilian Feature (%)", fontsize=10)
+    ax1.legend(fontsize=9)
+    ax1.grid(True, alpha=0.3)
+    
+    # Grammar
+    ax2.plot(years, results["mean_local_grammar"], label="Locals", color="blue", linewidth=2)
+    ax2.plot(years, results["mean_migrant_grammar"], label="Migrants", color="red", linewidth=2)
+    ax2.set_title("Grammar", fontsize=12, fontweight='bold')
+    ax2.legend(fontsize=9)
+    ax2.grid(True, alpha=0.3)
+    
+    # Phonetics
+    ax3.plot(years, results["mean_local_phonetics"], label="Locals", color="blue", linewidth=2)
+    ax3.plot(years, results["mean_migrant_phonetics"], label="Migrants", color="red", linewidth=2)
+    ax3.set_title("Phonetics", fontsize=12, fontweight='bold')
+    ax3.set_xlabel("Year", fontsize=10)
+    ax3.set_ylabel("Brazilian Feature (%)", fontsize=10)
+    ax3.legend(fontsize=9)
+    ax3.grid(True, alpha=0.3)
+    
+    # Pronouns
+    ax4.plot(years, results["mean_local_pronouns"], label="Locals", color="blue", linewidth=2)
+    ax4.plot(years, results["mean_migrant_pronouns"], label="Migrants", color="red", linewidth=2)
+    ax4.set_title("Pronouns", fontsize=12, fontweight='bold')
+    ax4.set_xlabel("Year", fontsize=10)
+    ax4.legend(fontsize=9)
+    ax4.grid(True, alpha=0.3)
+    
+    fig3.tight_layout()
+    return _png(fig3)
+
+
+@st.cache_data(max_entries=FIGURE_CACHE_ENTRIES)
+def comparison_figure(results):
+    """Locals' adoption of the four features on one chart, as PNG bytes."""
+    years = results["tick"] / 12
+    fig4 = Figure(figsize=(12, 6))
+    ax = fig4.subplots()
+    ax.plot(years, results["mean_local_vocab"], label="Vocabulary", linewidth=2)
+    ax.plot(years, results["mean_local_grammar"], label="Grammar", linewidth=2)
+    ax.plot(years, results["mean_local_phonetics"], label="Phonetics", linewidth=2)
+    ax.plot(years, results["mean_local_pronouns"], label="Pronouns", linewidth=2)
+    ax.set_xlabel("Year", fontsize=12)
+    ax.set_ylabel("Brazilian Feature (%)", fontsize=12)
+    ax.set_title("Comparative Feature Adoption by Locals", fontsize=14, fontweight='bold')
+    ax.legend(fontsize=10)
+    ax.grid(True, alpha=0.3)
+    return _png(fig4)
+
+
 # Initialize session state
 if 'results' not in st.session_state:
     st.session_state.results = None
-if 'model' not in st.session_state:
-    st.session_state.model = None
+if 'job' not in st.session_state:
+    st.session_state.job = None  # (future, progress, total_steps, simulation_years) while running
 
 # Sidebar: Parameters
 st.sidebar.header("📊 Simulation Parameters")
@@ -71,7 +218,12 @@ simulation_years = st.sidebar.slider("Simulation Years", 1, 50, 20, 1)
 
 # Run button
 st.sidebar.markdown("---")
-run_button = st.sidebar.button("🚀 Run Simulation", type="primary", use_container_width=True)
+# Disabled while a simulation is pending, so a new run never queues behind one whose
+# results would be discarded. A finished job no longer counts, so the button is
+# enabled again on the rerun that collects its results.
+job_pending = st.session_state.job is not None and not st.session_state.job[0].done()
+run_button = st.sidebar.button("🚀 Run Simulation", type="primary", use_container_width=True,
+                               disabled=job_pending)
 reset_button = st.sidebar.button("🔄 Reset to Defaults", use_container_width=True)
 
 # Reset functionality
@@ -79,7 +231,7 @@ if reset_button:
     st.rerun()
 
 # Main content area
-if run_button:
+if run_button and not job_pending:
     # Collect parameters
     params = {
         "number_locals": int(number_locals),
@@ -99,33 +251,32 @@ if run_button:
         "phonetic_influence_rate": phonetic_influence_rate,
     }
     
-    # Run simulation
-    with st.spinner(f"Running simulation for {simulation_years} years..."):
-        # Create progress bar
-        progress_bar = st.progress(0)
-        status_text = st.empty()
-        
-        # Initialize model
-        model = MigrationModel(params)
-        model.setup()
-        
-        # Run simulation with progress updates
-        total_steps = simulation_years * 12
-        for step in range(total_steps):
-            model.step()
-            
-            # Update progress
-            progress = (step + 1) / total_steps
-            progress_bar.progress(progress)
-            status_text.text(f"Year {step//12 + 1}/{simulation_years}, Month {step%12 + 1}")
-        
-        # Get results
-        st.session_state.results = model.get_results()
-        st.session_state.model = model
-        
-        progress_bar.empty()
-        status_text.empty()
-        st.success("✅ Simulation complete!")
+    # Run simulation in a worker process; its progress is polled below
+    total_steps = simulation_years * 12
+    progress = progress_manager().Value("i", 0)
+    future = simulation_executor().submit(run_one, params, total_steps, progress=progress)
+    st.session_state.job = (future, progress, total_steps, simulation_years)
+
+# Progress of a running simulation
+if st.session_state.job is not None:
+    future, progress, total_steps, years_to_run = st.session_state.job
+    if future.done():
+        st.session_state.job = None
+        try:
+            st.session_state.results = future.result()
+        except Exception as e:
+            st.error(f"Simulation failed: {e}")
+        else:
+            st.success("✅ Simulation complete!")
+    else:
+        step = progress.value
+        st.progress(step / total_steps)
+        st.text(f"Running simulation for {years_to_run} years: "
+                f"Year {min(step//12 + 1, years_to_run)}/{years_to_run}, Month {step%12 + 1}")
+        
+        # Rerun the script shortly to refresh the progress (and pick up the results)
+        time.sleep(POLL_INTERVAL)
+        st.rerun()
 
 # Display results if available
 if st.session_state.results is not None:
@@ -141,86 +292,21 @@ if st.session_state.results is not None:
         
         with col1:
             # Population sizes
-            fig1, ax1 = plt.subplots(figsize=(8, 6))
-            years = [t/12 for t in results["tick"]]
-            ax1.plot(years, results["total_locals"], label="Locals", color="blue", linewidth=2)
-            ax1.plot(years, results["total_migrants"], label="Migrants", color="red", linewidth=2)
-            ax1.set_xlabel("Year", fontsize=12)
-            ax1.set_ylabel("Population", fontsize=12)
-            ax1.set_title("Population Over Time", fontsize=14, fontweight='bold')
-            ax1.legend(fontsize=10)
-            ax1.grid(True, alpha=0.3)
-            st.pyplot(fig1)
+            st.image(population_figure(results), use_container_width=True)
         
         with col2:
             # Migrant proportion
-            fig2, ax2 = plt.subplots(figsize=(8, 6))
-            total_pop = [l + m for l, m in zip(results["total_locals"], results["total_migrants"])]
-            migrant_prop = [m / t * 100 if t > 0 else 0 for m, t in zip(results["total_migrants"], total_pop)]
-            ax2.plot(years, migrant_prop, color="purple", linewidth=2)
-            ax2.axhline(y=50, color='gray', linestyle='--', alpha=0.5, label="50% threshold")
-            ax2.set_xlabel("Year", fontsize=12)
-            ax2.set_ylabel("Migrant Proportion (%)", fontsize=12)
-            ax2.set_title("Migrant Proportion Over Time", fontsize=14, fontweight='bold')
-            ax2.legend(fontsize=10)
-            ax2.grid(True, alpha=0.3)
-            st.pyplot(fig2)
+            st.image(proportion_figure(results), use_container_width=True)
     
     with tab2:
         st.header("Linguistic Feature Evolution")
         
         # Create 2x2 subplot
-        fig3, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(14, 10))
-        years = [t/12 for t in results["tick"]]
-        
-        # Vocabulary
-        ax1.plot(years, results["mean_local_vocab"], label="Locals", color="blue", linewidth=2)
-        ax1.plot(years, results["mean_migrant_vocab"], label="Migrants", color="red", linewidth=2)
-        ax1.set_title("Vocabulary", fontsize=12, fontweight='bold')
-        ax1.set_ylabel("Brazilian Feature (%)", fontsize=10)
-        ax1.legend(fontsize=9)
-        ax1.grid(True, alpha=0.3)
-        
-        # Grammar
-        ax2.plot(years, results["mean_local_grammar"], label="Locals", color="blue", linewidth=2)
-        ax2.plot(years, results["mean_migrant_grammar"], label="Migrants", color="red", linewidth=2)
-        ax2.set_title("Grammar", fontsize=12, fontweight='bold')
-        ax2.legend(fontsize=9)
-        ax2.grid(True, alpha=0.3)
-        
-        # Phonetics
-        ax3.plot(years, results["mean_local_phonetics"], label="Locals", color="blue", linewidth=2)
-        ax3.plot(years, results["mean_migrant_phonetics"], label="Migrants", color="red", linewidth=2)
-        ax3.set_title("Phonetics", fontsize=12, fontweight='bold')
-        ax3.set_xlabel("Year", fontsize=10)
-        ax3.set_ylabel("Brazilian Feature (%)", fontsize=10)
-        ax3.legend(fontsize=9)
-        ax3.grid(True, alpha=0.3)
-        
-        # Pronouns
-        ax4.plot(years, results["mean_local_pronouns"], label="Locals", color="blue", linewidth=2)
-        ax4.plot(years, results["mean_migrant_pronouns"], label="Migrants", color="red", linewidth=2)
-        ax4.set_title("Pronouns", fontsize=12, fontweight='bold')
-        ax4.set_xlabel("Year", fontsize=10)
-        ax4.legend(fontsize=9)
-        ax4.grid(True, alpha=0.3)
-        
-        plt.tight_layout()
-        st.pyplot(fig3)
+        st.image(features_figure(results), use_container_width=True)
         
         # Feature comparison
         st.subheader("Feature Adoption Comparison (Locals)")
-        fig4, ax = plt.subplots(figsize=(12, 6))
-        ax.plot(years, results["mean_local_vocab"], label="Vocabulary", linewidth=2)
-        ax.plot(years, results["mean_local_grammar"], label="Grammar", linewidth=2)
-        ax.plot(years, results["mean_local_phonetics"], label="Phonetics", linewidth=2)
-        ax.plot(years, results["mean_local_pronouns"], label="Pronouns", linewidth=2)
-        ax.set_xlabel("Year", fontsize=12)
-        ax.set_ylabel("Brazilian Feature (%)", fontsize=12)
-        ax.set_title("Comparative Feature Adoption by Locals", fontsize=14, fontweight='bold')
-        ax.legend(fontsize=10)
-        ax.grid(True, alpha=0.3)
-        st.pyplot(fig4)
+        st.image(comparison_figure(results), use_container_width=True)
     
     with tab3:
         st.header("Summary Statistics")
@@ -332,16 +418,15 @@ if st.session_state.results is not None:
         Download the simulation results as a CSV file for further analysis in Excel, R, Python, or other tools.
         """)
         
-        # Convert to DataFrame
-        df = pd.DataFrame(results)
-        df['year'] = df['tick'] / 12
+        # Convert to DataFrame (cached, so reruns from other widgets skip the conversion)
+        df = results_frame(results)
         
         # Show preview
         st.subheader("Data Preview")
         st.dataframe(df.head(10), use_container_width=True)
         
         # Download button
-        csv = df.to_csv(index=False)
+        csv = results_to_csv(results)
         st.download_button(
             label="📥 Download CSV",
             data=csv,
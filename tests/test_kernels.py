@@ -0,0 +1,45 @@
+"""
+Tests that the NumPy fallbacks match the compiled kernels.
+"""
+
+import os
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from kernels import step_kernel, step_numpy
+
+
+def _columns(n, seed=0):
+    """Random Population columns for `n` occupied slots."""
+    rng = np.random.default_rng(seed)
+    return (rng.uniform(0, 100, (n, 4)).astype(np.float32),
+            rng.uniform(0, 100, n).astype(np.float32),
+            rng.integers(0, 120, n).astype(np.int32),
+            rng.random(n) < 0.9,
+            rng.random(n) < 0.2,
+            rng.integers(0, 5, n).astype(np.int32))
+
+
+class StepNumpyTest(unittest.TestCase):
+    def test_matches_step_kernel(self):
+        n = 1000
+        media_scale = np.linspace(0.1, 0.5, 5, dtype=np.float32)
+        media_weights = np.array([0.05, 0.03, 0.01, 0.02], dtype=np.float32)
+        death_rate_lut = np.linspace(0.0, 1.0, 101)
+        draws = np.random.default_rng(1).random(n)
+        for annual in (False, True):
+            with self.subTest(annual=annual):
+                compiled, vectorized = _columns(n), _columns(n)
+                dies = step_kernel(*compiled, media_scale, media_weights, annual, draws, death_rate_lut)
+                fallback = step_numpy(*vectorized, media_scale, media_weights, annual, draws, death_rate_lut)
+                np.testing.assert_array_equal(dies, fallback)
+                np.testing.assert_allclose(compiled[0], vectorized[0], atol=1e-4)
+                np.testing.assert_array_equal(compiled[2], vectorized[2])
+
+
+if __name__ == "__main__":
+    unittest.main()
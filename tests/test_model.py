@@ -0,0 +1,42 @@
+"""
+Tests for running simulations in-process and in parallel worker processes.
+"""
+
+import os
+import subprocess
+import sys
+import textwrap
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Generous upper bound for the whole script; a deadlock never finishes
+TIMEOUT = 300
+
+
+class RunManyTest(unittest.TestCase):
+    def test_run_many_after_run_one(self):
+        # Running a simulation first starts the parallel kernels in the process,
+        # which used to deadlock forked workers (or the process at exit), so the
+        # scenario runs in a fresh interpreter that must finish in time
+        script = textwrap.dedent("""
+            import numpy as np
+            from model import run_many, run_one
+            
+            if __name__ == "__main__":
+                params = {"number_locals": 200, "number_migrants": 20, "annual_br_inflow": 24,
+                          "reveal_share_locals": 0.3, "reveal_share_migrants": 0.7}
+                expected = run_one(params, 24, seed=1)
+                results = run_many(params, 24, [1, 2, 3], max_workers=3)
+                assert len(results) == 3
+                # Same seed, same run, whichever process it runs in
+                for key, values in expected.items():
+                    np.testing.assert_array_equal(results[0][key], values)
+        """)
+        completed = subprocess.run([sys.executable, "-c", script], cwd=ROOT, timeout=TIMEOUT,
+                                   stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+        self.assertEqual(completed.returncode, 0, completed.stderr)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+"""
+Tests for the plotting helpers' conversion cache.
+"""
+
+import os
+import sys
+import unittest
+from dataclasses import fields
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from visualization import SimArrays, _sim_arrays
+
+
+def _results(n, value=1.0):
+    """Results dictionary of an `n`-month run with constant feature means."""
+    data = {field.name: np.full(n, value, dtype=np.float32)
+            for field in fields(SimArrays) if field.name.startswith("mean_")}
+    data.update(tick=np.arange(n), total_locals=np.full(n, 100), total_migrants=np.full(n, 10))
+    return data
+
+
+class SimArraysCacheTest(unittest.TestCase):
+    def test_same_results_converted_once(self):
+        data = _results(24)
+        self.assertIs(_sim_arrays(data), _sim_arrays(data))
+    
+    def test_replaced_series_converted_again(self):
+        data = _results(24)
+        _sim_arrays(data)
+        data["mean_local_vocab"] = np.full(24, 50.0, dtype=np.float32)
+        np.testing.assert_array_equal(_sim_arrays(data).mean_local_vocab, data["mean_local_vocab"])
+    
+    def test_grown_series_converted_again(self):
+        data = {key: list(values) for key, values in _results(12).items()}
+        _sim_arrays(data)
+        for key, values in data.items():
+            values.append(12 if key == "tick" else values[-1])
+        self.assertEqual(len(_sim_arrays(data).tick), 13)
+    
+    def test_new_results_of_same_length(self):
+        for value in (1.0, 2.0, 3.0):
+            # Each dictionary is freed after use, so a later one may get the same id
+            self.assertEqual(_sim_arrays(_results(24, value)).mean_local_vocab[0], value)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,168 +3,548 @@ Visualization utilities for the migration simulation.
 Creates plots and charts to analyze simulation results.
 """
 
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, fields
+from itertools import repeat
+
 import matplotlib.pyplot as plt
+from matplotlib.collections import LineCollection, PathCollection
+from matplotlib.figure import Figure
+from matplotlib.lines import Line2D
+from matplotlib.markers import MarkerStyle
+from matplotlib.transforms import IdentityTransform
 import numpy as np
 
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    HAVE_PYARROW = True
+except ImportError:  # pyarrow is optional, for Parquet export
+    HAVE_PYARROW = False
+
 
-def plot_linguistic_features(data, save_path=None):
+@dataclass
+class SimArrays:
     """
-    Plot the evolution of linguistic features over time.
+    Collected series of one run as typed NumPy arrays.
+    
+    Build it once with `SimArrays.from_data` and pass it to several plot
+    functions so the series are converted only once. Series can also be read
+    by key, like the model's data dictionary.
+    """
+    tick: np.ndarray
+    years: np.ndarray
+    total_locals: np.ndarray
+    total_migrants: np.ndarray
+    mean_local_vocab: np.ndarray
+    mean_local_grammar: np.ndarray
+    mean_local_phonetics: np.ndarray
+    mean_local_pronouns: np.ndarray
+    mean_migrant_vocab: np.ndarray
+    mean_migrant_grammar: np.ndarray
+    mean_migrant_phonetics: np.ndarray
+    mean_migrant_pronouns: np.ndarray
+    
+    @classmethod
+    def from_data(cls, data):
+        """
+        Convert a data dictionary from the model (returned as is if already converted).
+        
+        Args:
+            data: Dictionary of collected data from the model, or a SimArrays
+        """
+        if isinstance(data, cls):
+            return data
+        
+        series = {}
+        for field in fields(cls):
+            if field.name == "years":
+                continue
+            dtype = np.float32 if field.name.startswith("mean_") else np.int32
+            series[field.name] = np.asarray(data[field.name], dtype=dtype)
+        return cls(years=series["tick"].astype(np.float32) / np.float32(12), **series)
+    
+    def __getitem__(self, key):
+        return getattr(self, key)
+
+
+# Recent conversions as (data, series, lengths, arrays), newest last. A cached
+# conversion is only reused for the very same dictionary holding the very same
+# series objects at the same lengths, all compared by identity; entries hold
+# these objects, so their ids cannot be reused while cached. A series that is
+# replaced or grows is therefore converted again. Only the last few runs are kept.
+_ARRAYS_CACHE = []
+_ARRAYS_CACHE_SIZE = 4
+
+
+def _sim_arrays(data):
+    """`SimArrays.from_data`, memoized so plotting one run several times converts it once."""
+    if isinstance(data, SimArrays):
+        return data
+    
+    series = [data[field.name] for field in fields(SimArrays) if field.name != "years"]
+    lengths = [len(values) for values in series]
+    for cached_data, cached_series, cached_lengths, arrays in _ARRAYS_CACHE:
+        if (cached_data is data and cached_lengths == lengths
+                and all(old is new for old, new in zip(cached_series, series))):
+            return arrays
+    
+    arrays = SimArrays.from_data(data)
+    _ARRAYS_CACHE.append((data, series, lengths, arrays))
+    if len(_ARRAYS_CACHE) > _ARRAYS_CACHE_SIZE:
+        del _ARRAYS_CACHE[0]  # Oldest entry
+    return arrays
+
+
+# Rendering settings for every figure: paths are simplified to within a pixel
+# (so SVG output holds fewer path points) and long ones are drawn by Agg in
+# chunks. Collections fix their paths' simplification when created and lines
+# when drawn, so the settings apply both while a plot function runs and
+# whenever its figure is drawn later (savefig, interactive redraws).
+_RENDER_SETTINGS = {
+    'path.simplify': True,
+    'path.simplify_threshold': 1.0,
+    'agg.path.chunksize': 10000,
+}
+
+# Styling shared by every figure, applied while each plot function runs (and
+# not globally, so other matplotlib users in the process are unaffected)
+_STYLE = {
+    'axes.grid': True,
+    'grid.alpha': 0.3,
+    **_RENDER_SETTINGS,
+}
+
+
+class _PlotFigure(Figure):
+    """Figure that always draws with `_RENDER_SETTINGS`."""
+    
+    def draw(self, renderer):
+        with plt.rc_context(_RENDER_SETTINGS):
+            super().draw(renderer)
+
+
+def _style_axes(ax, xlabel, ylabel, title, legend=True):
+    """Label an axes in one call and add its legend."""
+    ax.set(xlabel=xlabel, ylabel=ylabel, title=title)
+    if legend:
+        ax.legend()
+
+
+# Longest series drawn point for point; longer runs are decimated to this size,
+# which is still more points than a figure has pixels across
+MAX_PLOT_POINTS = 2000
+
+
+def decimate(x, y, target=MAX_PLOT_POINTS):
+    """
+    Downsample a series with Largest-Triangle-Three-Buckets.
+    
+    Keeps the first and last points and, from each of `target - 2` buckets in
+    between, the point forming the largest triangle with the previously kept
+    point and the mean of the next bucket, so peaks and dips survive.
     
     Args:
-        data: Dictionary of collected data from the model
-        save_path: Optional path to save the figure
+        x, y: Series to downsample, as arrays of equal length
+        target: Number of points to keep
+    
+    Returns:
+        (x, y) with at most `target` points (the inputs if already short enough)
+    """
+    n = len(x)
+    if n <= target or target < 3:
+        return x, y
+    
+    buckets = np.array_split(np.arange(1, n - 1), target - 2)
+    keep = np.empty(target, dtype=np.intp)
+    keep[0], keep[-1] = 0, n - 1
+    a = 0
+    for b, bucket in enumerate(buckets):
+        if b + 1 < len(buckets):
+            following = buckets[b + 1]
+            cx, cy = x[following].mean(), y[following].mean()
+        else:
+            cx, cy = x[-1], y[-1]
+        # Twice the triangle area, from the cross product of its two edges at point a
+        area = np.abs((x[bucket] - x[a]) * (cy - y[a]) - (cx - x[a]) * (y[bucket] - y[a]))
+        a = bucket[np.argmax(area)]
+        keep[b + 1] = a
+    return x[keep], y[keep]
+
+
+def _plot(artists, key, ax, x, y, *args, **kwargs):
+    """
+    `ax.plot` of a series decimated with `decimate`.
+    
+    If `artists` already holds a line under `key` (the figure is being
+    reused), that line gets the new data instead of a new line being created.
+    
+    Args:
+        artists: Artist dictionary of the figure, from `_get_figure`
+        key: Name of the line within the figure
+        ax, x, y, *args, **kwargs: As for `ax.plot`
+    """
+    x, y = decimate(x, y)
+    line = artists.get(key)
+    if line is None:
+        artists[key], = ax.plot(x, y, *args, **kwargs)
+    else:
+        line.set_data(x, y)
+        ax.relim()
+        ax.autoscale_view()
+
+
+# Series of the feature comparison plots: (feature, color, marker, label)
+_FEATURE_LINES = [
+    ('vocab', 'b', 'o', 'Vocabulary'),
+    ('grammar', 'g', 's', 'Grammar'),
+    ('pronouns', 'm', '^', 'Pronouns'),
+    ('phonetics', 'r', 'd', 'Phonetics'),
+]
+
+
+def _plot_features(artists, ax, arr, group, markers=False, markersize=3):
     """
-    fig, axes = plt.subplots(2, 2, figsize=(14, 10))
-    fig.suptitle('Evolution of Brazilian Portuguese Features in Locals', fontsize=16, fontweight='bold')
-    
-    # Convert ticks to years
-    years = np.array(data["tick"]) / 12
-    
-    # Vocabulary
-    axes[0, 0].plot(years, data["mean_local_vocab"], 'b-', linewidth=2, label='Locals')
-    axes[0, 0].set_xlabel('Years')
-    axes[0, 0].set_ylabel('Brazilian Vocabulary (%)')
-    axes[0, 0].set_title('Vocabulary (autocarro→ônibus, sumo→suco)')
-    axes[0, 0].grid(True, alpha=0.3)
-    axes[0, 0].legend()
-    
-    # Grammar
-    axes[0, 1].plot(years, data["mean_local_grammar"], 'g-', linewidth=2, label='Locals')
-    axes[0, 1].set_xlabel('Years')
-    axes[0, 1].set_ylabel('Brazilian Grammar (%)')
-    axes[0, 1].set_title('Grammar (nós vamos→a gente vai)')
-    axes[0, 1].grid(True, alpha=0.3)
-    axes[0, 1].legend()
-    
-    # Phonetics
-    axes[1, 0].plot(years, data["mean_local_phonetics"], 'r-', linewidth=2, label='Locals')
-    axes[1, 0].set_xlabel('Years')
-    axes[1, 0].set_ylabel('Brazilian Phonetics (%)')
-    axes[1, 0].set_title('Phonetics (/t/→/tʃ/ before [i])')
-    axes[1, 0].grid(True, alpha=0.3)
-    axes[1, 0].legend()
-    
-    # Pronouns
-    axes[1, 1].plot(years, data["mean_local_pronouns"], 'm-', linewidth=2, label='Locals')
-    axes[1, 1].set_xlabel('Years')
-    axes[1, 1].set_ylabel('Brazilian Pronouns (%)')
-    axes[1, 1].set_title('Pronouns (amo-te→te amo)')
-    axes[1, 1].grid(True, alpha=0.3)
-    axes[1, 1].legend()
-    
-    plt.tight_layout()
+    Draw one group's four mean feature series on an axes.
     
+    All lines go into a single LineCollection and any markers into a single
+    PathCollection, instead of one Line2D artist per series. On a reused
+    figure the collections get the new data in place.
+    
+    Args:
+        artists: Artist dictionary of the figure, from `_get_figure`
+        ax: Axes to draw on
+        arr: SimArrays of the run
+        group: 'local' or 'migrant'
+        markers: Whether to mark every point with the series' marker
+        markersize: Marker size in points, as for `ax.plot`
+    
+    Returns:
+        Legend handles for the series
+    """
+    segments, paths, colors, handles = [], [], [], []
+    for feature, color, marker, label in _FEATURE_LINES:
+        x, y = decimate(arr.years, arr[f'mean_{group}_{feature}'])
+        segments.append(np.column_stack((x, y)))
+        if markers:
+            style = MarkerStyle(marker)
+            paths += [style.get_path().transformed(style.get_transform())] * len(x)
+            colors += [color] * len(x)
+        handles.append(Line2D([], [], color=color, linewidth=2, label=label,
+                              marker=marker if markers else None, markersize=markersize))
+    
+    points = np.concatenate(segments)
+    if 'features' in artists:
+        artists['features'].set_segments(segments)
+        if markers:
+            collection = artists['feature_markers']
+            collection.set_paths(paths)
+            collection.set_offsets(points)
+            collection.set_color(colors)
+        ax.ignore_existing_data_limits = True
+        ax.update_datalim(points)
+    else:
+        artists['features'] = ax.add_collection(LineCollection(
+            segments, colors=[line[1] for line in _FEATURE_LINES], linewidths=2))
+        if markers:
+            collection = PathCollection(paths, sizes=[markersize ** 2], offsets=points,
+                                        offset_transform=ax.transData, facecolors=colors,
+                                        edgecolors=colors)
+            collection.set_transform(IdentityTransform())  # Marker paths are in points, as in `ax.scatter`
+            artists['feature_markers'] = ax.add_collection(collection, autolim=False)
+    ax.autoscale_view()
+    return handles
+
+
+# zlib level for saved PNGs; matplotlib's default of 6 is several times slower
+# to encode than 3 for plots and barely smaller. Set LABM_PNG_COMPRESS (0-9) to tune.
+PNG_COMPRESS_LEVEL = 3
+
+
+# Output formats in which the data lines are embedded as one image rather than
+# as thousands of path segments; text, axes and legends stay vector. SVG is
+# left fully vector, so it stays editable and scales without loss.
+RASTERIZED_FORMATS = ('.pdf', '.eps', '.ps')
+
+
+def _save(fig, path):
+    """Save a figure at print resolution, with fast compression for PNGs."""
+    kwargs = {}
+    suffix = os.path.splitext(str(path))[1].lower()
+    if suffix == '.png':
+        level = int(os.environ.get('LABM_PNG_COMPRESS', PNG_COMPRESS_LEVEL))
+        kwargs['pil_kwargs'] = {'compress_level': level, 'optimize': False}
+    
+    data_artists = [artist for ax in fig.axes for artist in (*ax.lines, *ax.collections)]
+    rasterize = suffix in RASTERIZED_FORMATS
+    for artist in data_artists:
+        artist.set_rasterized(rasterize)
+    try:
+        fig.savefig(path, dpi=300, **kwargs)
+    finally:
+        for artist in data_artists:
+            artist.set_rasterized(False)
+
+
+# Figures of the plot functions that are still open, keyed by (plot, nrows,
+# ncols, figsize), as (figure, axes, artists); plotting again updates the
+# existing lines in the same window
+_FIGURE_CACHE = {}
+
+
+def _get_figure(plot, nrows=1, ncols=1, figsize=None, sharex=False):
+    """
+    `plt.subplots` for one plot function, reusing its figure if still open.
+    
+    A reused figure keeps its axes, labels and plotted artists, so a new run
+    only replaces the line data. Closed figures (e.g. after a batch save) are
+    replaced by new ones.
+    
+    Args:
+        plot: Key of the plot the figure belongs to, e.g. its function name
+        nrows, ncols, figsize, sharex: As for `plt.subplots`
+    
+    Returns:
+        (figure, axes, artists): axes as from `plt.subplots`, and the
+        figure's artists by name, empty for a new figure
+    """
+    key = (plot, nrows, ncols, figsize, sharex)
+    entry = _FIGURE_CACHE.get(key)
+    if entry is None or not plt.fignum_exists(entry[0].number):
+        fig, axes = plt.subplots(nrows, ncols, figsize=figsize, sharex=sharex, layout='constrained',
+                                 FigureClass=_PlotFigure)
+        entry = _FIGURE_CACHE[key] = (fig, axes, {})
+    return entry
+
+
+def _finish(fig, save_path, show, description):
+    """Save a finished figure if asked, then show or close it."""
     if save_path:
-        plt.savefig(save_path, dpi=300, bbox_inches='tight')
-        print(f"Saved linguistic features plot to {save_path}")
+        _save(fig, save_path)
+        print(f"Saved {description} to {save_path}")
+    
+    if show is None:
+        show = plt.isinteractive()
+    if show:
+        plt.show()
+    else:
+        plt.close(fig)
+    return fig
+
+
+@plt.rc_context(_STYLE)
+def plot_linguistic_features(data, save_path=None, show=None):
+    """
+    Plot the evolution of linguistic features over time.
     
-    plt.show()
+    Args:
+        data: Dictionary of collected data from the model, or a SimArrays
+        save_path: Optional path to save the figure
+        show: Whether to show the figure; defaults to matplotlib's interactive
+            mode, so batch runs close it instead
+    
+    Returns:
+        The matplotlib Figure
+    """
+    arr = _sim_arrays(data)
+    years = arr.years
+    
+    fig, axes, artists = _get_figure('linguistic_features', 2, 2, figsize=(14, 10), sharex=True)
+    new = not artists
+    if new:
+        fig.suptitle('Evolution of Brazilian Portuguese Features in Locals', fontsize=16, fontweight='bold')
+    
+    # One panel per feature: (axes, feature, line style, y label, title). The
+    # panels share one time axis, labelled on the bottom row only.
+    panels = [
+        (axes[0, 0], 'vocab', 'b-', 'Brazilian Vocabulary (%)',
+         'Vocabulary (autocarro→ônibus, sumo→suco)'),
+        (axes[0, 1], 'grammar', 'g-', 'Brazilian Grammar (%)',
+         'Grammar (nós vamos→a gente vai)'),
+        (axes[1, 0], 'phonetics', 'r-', 'Brazilian Phonetics (%)',
+         'Phonetics (/t/→/tʃ/ before [i])'),
+        (axes[1, 1], 'pronouns', 'm-', 'Brazilian Pronouns (%)',
+         'Pronouns (amo-te→te amo)'),
+    ]
+    for ax, feature, style, ylabel, title in panels:
+        _plot(artists, feature, ax, years, arr[f'mean_local_{feature}'], style, linewidth=2, label='Locals')
+        if new:
+            xlabel = 'Years' if ax.get_subplotspec().is_last_row() else ''
+            _style_axes(ax, xlabel, ylabel, title)
+    
+    return _finish(fig, save_path, show, 'linguistic features plot')
 
 
-def plot_demographics(data, save_path=None):
+@plt.rc_context(_STYLE)
+def plot_demographics(data, save_path=None, show=None):
     """
     Plot demographic changes over time.
     
     Args:
-        data: Dictionary of collected data from the model
+        data: Dictionary of collected data from the model, or a SimArrays
         save_path: Optional path to save the figure
+        show: Whether to show the figure; defaults to matplotlib's interactive
+            mode, so batch runs close it instead
+    
+    Returns:
+        The matplotlib Figure
     """
-    fig, axes = plt.subplots(1, 2, figsize=(14, 5))
-    fig.suptitle('Demographic Dynamics', fontsize=16, fontweight='bold')
+    arr = _sim_arrays(data)
+    years = arr.years
     
-    years = np.array(data["tick"]) / 12
+    fig, axes, artists = _get_figure('demographics', 1, 2, figsize=(14, 5))
+    new = not artists
+    if new:
+        fig.suptitle('Demographic Dynamics', fontsize=16, fontweight='bold')
     
     # Population sizes
-    axes[0].plot(years, data["total_locals"], 'b-', linewidth=2, label='Locals')
-    axes[0].plot(years, data["total_migrants"], 'r-', linewidth=2, label='Migrants')
-    axes[0].set_xlabel('Years')
-    axes[0].set_ylabel('Population')
-    axes[0].set_title('Population Sizes Over Time')
-    axes[0].grid(True, alpha=0.3)
-    axes[0].legend()
+    _plot(artists, 'locals', axes[0], years, arr.total_locals, 'b-', linewidth=2, label='Locals')
+    _plot(artists, 'migrants', axes[0], years, arr.total_migrants, 'r-', linewidth=2, label='Migrants')
     
     # Proportion of migrants
-    total_pop = np.array(data["total_locals"]) + np.array(data["total_migrants"])
-    migrant_proportion = np.array(data["total_migrants"]) / total_pop * 100
-    
-    axes[1].plot(years, migrant_proportion, 'purple', linewidth=2)
-    axes[1].set_xlabel('Years')
-    axes[1].set_ylabel('Migrants (%)')
-    axes[1].set_title('Proportion of Migrants in Total Population')
-    axes[1].grid(True, alpha=0.3)
+    total_pop = arr.total_locals + arr.total_migrants
+    migrant_proportion = np.divide(arr.total_migrants, total_pop, dtype=np.float32) * np.float32(100)
     
-    plt.tight_layout()
+    _plot(artists, 'proportion', axes[1], years, migrant_proportion, 'purple', linewidth=2)
     
-    if save_path:
-        plt.savefig(save_path, dpi=300, bbox_inches='tight')
-        print(f"Saved demographics plot to {save_path}")
+    if new:
+        _style_axes(axes[0], 'Years', 'Population', 'Population Sizes Over Time')
+        _style_axes(axes[1], 'Years', 'Migrants (%)', 'Proportion of Migrants in Total Population', legend=False)
     
-    plt.show()
+    return _finish(fig, save_path, show, 'demographics plot')
 
 
-def plot_all_features_comparison(data, save_path=None):
+@plt.rc_context(_STYLE)
+def plot_all_features_comparison(data, save_path=None, show=None, markers=False):
     """
     Plot all linguistic features on one chart for comparison.
     
     Args:
-        data: Dictionary of collected data from the model
+        data: Dictionary of collected data from the model, or a SimArrays
         save_path: Optional path to save the figure
-    """
-    fig, ax = plt.subplots(figsize=(12, 7))
-    
-    years = np.array(data["tick"]) / 12
+        show: Whether to show the figure; defaults to matplotlib's interactive
+            mode, so batch runs close it instead
+        markers: Whether to mark every data point (off by default, as the
+            small markers add drawing time without being distinguishable)
     
-    ax.plot(years, data["mean_local_vocab"], 'b-', linewidth=2, label='Vocabulary', marker='o', markersize=3)
-    ax.plot(years, data["mean_local_grammar"], 'g-', linewidth=2, label='Grammar', marker='s', markersize=3)
-    ax.plot(years, data["mean_local_pronouns"], 'm-', linewidth=2, label='Pronouns', marker='^', markersize=3)
-    ax.plot(years, data["mean_local_phonetics"], 'r-', linewidth=2, label='Phonetics', marker='d', markersize=3)
+    Returns:
+        The matplotlib Figure
+    """
+    arr = _sim_arrays(data)
     
-    ax.set_xlabel('Years', fontsize=12)
-    ax.set_ylabel('Adoption of Brazilian Features (%)', fontsize=12)
-    ax.set_title('Comparative Adoption of Brazilian Portuguese Features by Locals', fontsize=14, fontweight='bold')
-    ax.grid(True, alpha=0.3)
-    ax.legend(fontsize=11)
+    fig, ax, artists = _get_figure(('all_features_comparison', markers), figsize=(12, 7))
+    new = not artists
     
-    plt.tight_layout()
+    handles = _plot_features(artists, ax, arr, 'local', markers)
     
-    if save_path:
-        plt.savefig(save_path, dpi=300, bbox_inches='tight')
-        print(f"Saved comparison plot to {save_path}")
+    if new:
+        ax.set_xlabel('Years', fontsize=12)
+        ax.set_ylabel('Adoption of Brazilian Features (%)', fontsize=12)
+        ax.set_title('Comparative Adoption of Brazilian Portuguese Features by Locals', fontsize=14, fontweight='bold')
+        ax.legend(handles=handles, fontsize=11)
     
-    plt.show()
+    return _finish(fig, save_path, show, 'comparison plot')
 
 
-def plot_migrant_features(data, save_path=None):
+@plt.rc_context(_STYLE)
+def plot_migrant_features(data, save_path=None, show=None, markers=False):
     """
     Plot the evolution of linguistic features for migrants (convergence to Portuguese).
     
     Args:
-        data: Dictionary of collected data from the model
+        data: Dictionary of collected data from the model, or a SimArrays
         save_path: Optional path to save the figure
+        show: Whether to show the figure; defaults to matplotlib's interactive
+            mode, so batch runs close it instead
+        markers: Whether to mark every data point (off by default, as the
+            small markers add drawing time without being distinguishable)
+    
+    Returns:
+        The matplotlib Figure
     """
-    fig, ax = plt.subplots(figsize=(12, 7))
+    arr = _sim_arrays(data)
     
-    years = np.array(data["tick"]) / 12
+    fig, ax, artists = _get_figure(('migrant_features', markers), figsize=(12, 7))
+    new = not artists
     
-    ax.plot(years, data["mean_migrant_vocab"], 'b-', linewidth=2, label='Vocabulary', marker='o', markersize=3)
-    ax.plot(years, data["mean_migrant_grammar"], 'g-', linewidth=2, label='Grammar', marker='s', markersize=3)
-    ax.plot(years, data["mean_migrant_pronouns"], 'm-', linewidth=2, label='Pronouns', marker='^', markersize=3)
-    ax.plot(years, data["mean_migrant_phonetics"], 'r-', linewidth=2, label='Phonetics', marker='d', markersize=3)
+    handles = _plot_features(artists, ax, arr, 'migrant', markers)
     
-    ax.set_xlabel('Years', fontsize=12)
-    ax.set_ylabel('Brazilian Features Retention (%)', fontsize=12)
-    ax.set_title('Retention of Brazilian Portuguese Features by Migrants', fontsize=14, fontweight='bold')
-    ax.grid(True, alpha=0.3)
-    ax.legend(fontsize=11)
+    if new:
+        ax.set_xlabel('Years', fontsize=12)
+        ax.set_ylabel('Brazilian Features Retention (%)', fontsize=12)
+        ax.set_title('Retention of Brazilian Portuguese Features by Migrants', fontsize=14, fontweight='bold')
+        ax.legend(handles=handles, fontsize=11)
     
-    plt.tight_layout()
+    return _finish(fig, save_path, show, 'migrant features plot')
+
+
+# Plots written by `render_all`: (plot function name, file name)
+_RENDERED_PLOTS = [
+    ('plot_linguistic_features', 'linguistic_features.png'),
+    ('plot_demographics', 'demographics.png'),
+    ('plot_all_features_comparison', 'all_features_comparison.png'),
+    ('plot_migrant_features', 'migrant_features.png'),
+]
+
+
+def _render_one(plot, arr, path):
+    """Save one plot headlessly in a worker process of `render_all`."""
+    plt.switch_backend('Agg')
+    globals()[plot](arr, save_path=path, show=False)
+    return path
+
+
+def render_all(data, outdir, max_workers=None):
+    """
+    Save all four plots of a run to files, drawing them in parallel processes.
     
-    if save_path:
-        plt.savefig(save_path, dpi=300, bbox_inches='tight')
-        print(f"Saved migrant features plot to {save_path}")
+    Workers are spawned, so scripts calling this must guard their entry point
+    with `if __name__ == '__main__':`.
+    
+    Args:
+        data: Dictionary of collected data from the model, or a SimArrays
+        outdir: Directory to write the PNG files to (created if missing)
+        max_workers: Number of worker processes (defaults to one per plot,
+            capped at the CPU count)
     
-    plt.show()
+    Returns:
+        List of the saved file paths
+    """
+    os.makedirs(outdir, exist_ok=True)
+    arr = _sim_arrays(data)
+    plots = [plot for plot, _ in _RENDERED_PLOTS]
+    paths = [os.path.join(outdir, name) for _, name in _RENDERED_PLOTS]
+    if max_workers is None:
+        max_workers = min(len(plots), os.cpu_count() or 1)
+    
+    # Spawned rather than forked workers: forking a process that has already
+    # run the parallel Numba kernels can leave it hanging at exit
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=context) as executor:
+        return list(executor.map(_render_one, plots, repeat(arr), paths))
+
+
+def _result_lines(arr):
+    """Final population and feature change lines of the summary report."""
+    locals_, migrants = int(arr.total_locals[-1]), int(arr.total_migrants[-1])
+    total = locals_ + migrants
+    
+    lines = ["\nFinal Population:"]
+    lines.append(f"  Locals: {locals_}")
+    lines.append(f"  Migrants: {migrants}")
+    lines.append(f"  Total: {total}")
+    lines.append(f"  Migrant Proportion: {migrants / max(total, 1) * 100:.2f}%")
+    
+    features = [('vocab', 'Vocabulary'), ('grammar', 'Grammar'),
+                ('phonetics', 'Phonetics'), ('pronouns', 'Pronouns')]
+    for group, heading in (('local', 'Locals'), ('migrant', 'Migrants')):
+        lines.append(f"\nLinguistic Integration ({heading}):")
+        for feature, name in features:
+            first, last = arr[f'mean_{group}_{feature}'].take([0, -1])
+            lines.append(f"  Initial → Final Brazilian {name}: {first:.2f}% → {last:.2f}%")
+    return lines
 
 
 def create_summary_report(data, params):
@@ -172,77 +552,76 @@ def create_summary_report(data, params):
     Create a text summary of simulation results.
     
     Args:
-        data: Dictionary of collected data from the model
+        data: Dictionary of collected data from the model, or a SimArrays
         params: Dictionary of model parameters
-    """
-    print("\n" + "="*60)
-    print("SIMULATION SUMMARY REPORT")
-    print("="*60)
-    
-    print("\nModel Parameters:")
-    print(f"  Initial Locals: {params.get('number_locals', 'N/A')}")
-    print(f"  Initial Migrants: {params.get('number_migrants', 'N/A')}")
-    print(f"  Annual Brazilian Inflow: {params.get('annual_br_inflow', 'N/A')}")
-    print(f"  Base Media Influence: {params.get('base_media_influence', 'N/A')}")
-    print(f"  Reveal Share (Locals): {params.get('reveal_share_locals', 'N/A')}")
-    print(f"  Reveal Share (Migrants): {params.get('reveal_share_migrants', 'N/A')}")
-    
-    print("\nFinal Population:")
-    print(f"  Locals: {data['total_locals'][-1]}")
-    print(f"  Migrants: {data['total_migrants'][-1]}")
-    print(f"  Total: {data['total_locals'][-1] + data['total_migrants'][-1]}")
-    print(f"  Migrant Proportion: {data['total_migrants'][-1] / (data['total_locals'][-1] + data['total_migrants'][-1]) * 100:.2f}%")
     
-    print("\nLinguistic Integration (Locals):")
-    print(f"  Initial → Final Brazilian Vocabulary: {data['mean_local_vocab'][0]:.2f}% → {data['mean_local_vocab'][-1]:.2f}%")
-    print(f"  Initial → Final Brazilian Grammar: {data['mean_local_grammar'][0]:.2f}% → {data['mean_local_grammar'][-1]:.2f}%")
-    print(f"  Initial → Final Brazilian Phonetics: {data['mean_local_phonetics'][0]:.2f}% → {data['mean_local_phonetics'][-1]:.2f}%")
-    print(f"  Initial → Final Brazilian Pronouns: {data['mean_local_pronouns'][0]:.2f}% → {data['mean_local_pronouns'][-1]:.2f}%")
-    
-    print("\nLinguistic Integration (Migrants):")
-    print(f"  Initial → Final Brazilian Vocabulary: {data['mean_migrant_vocab'][0]:.2f}% → {data['mean_migrant_vocab'][-1]:.2f}%")
-    print(f"  Initial → Final Brazilian Grammar: {data['mean_migrant_grammar'][0]:.2f}% → {data['mean_migrant_grammar'][-1]:.2f}%")
-    print(f"  Initial → Final Brazilian Phonetics: {data['mean_migrant_phonetics'][0]:.2f}% → {data['mean_migrant_phonetics'][-1]:.2f}%")
-    print(f"  Initial → Final Brazilian Pronouns: {data['mean_migrant_pronouns'][0]:.2f}% → {data['mean_migrant_pronouns'][-1]:.2f}%")
-    
-    print("\n" + "="*60)
+    Returns:
+        The report text, which is also printed in one write
+    """
+    lines = ["\n" + "="*60, "SIMULATION SUMMARY REPORT", "="*60]
+    
+    lines.append("\nModel Parameters:")
+    lines.append(f"  Initial Locals: {params.get('number_locals', 'N/A')}")
+    lines.append(f"  Initial Migrants: {params.get('number_migrants', 'N/A')}")
+    lines.append(f"  Annual Brazilian Inflow: {params.get('annual_br_inflow', 'N/A')}")
+    lines.append(f"  Base Media Influence: {params.get('base_media_influence', 'N/A')}")
+    lines.append(f"  Reveal Share (Locals): {params.get('reveal_share_locals', 'N/A')}")
+    lines.append(f"  Reveal Share (Migrants): {params.get('reveal_share_migrants', 'N/A')}")
+    
+    arr = _sim_arrays(data)
+    if len(arr.tick):
+        lines += _result_lines(arr)
+    else:
+        lines.append("\nNo data collected: the run has no steps.")
+    
+    lines.append("\n" + "="*60)
+    
+    report = "\n".join(lines)
+    print(report)
+    return report
+
+
+# Columns of the exported results: (header, series, number format)
+_EXPORT_COLUMNS = [
+    ('Tick', 'tick', '%d'),
+    ('Year', 'years', '%.6f'),
+    ('Total_Locals', 'total_locals', '%d'),
+    ('Total_Migrants', 'total_migrants', '%d'),
+    ('Local_Vocab', 'mean_local_vocab', '%.6f'),
+    ('Local_Grammar', 'mean_local_grammar', '%.6f'),
+    ('Local_Phonetics', 'mean_local_phonetics', '%.6f'),
+    ('Local_Pronouns', 'mean_local_pronouns', '%.6f'),
+    ('Migrant_Vocab', 'mean_migrant_vocab', '%.6f'),
+    ('Migrant_Grammar', 'mean_migrant_grammar', '%.6f'),
+    ('Migrant_Phonetics', 'mean_migrant_phonetics', '%.6f'),
+    ('Migrant_Pronouns', 'mean_migrant_pronouns', '%.6f'),
+]
 
 
 def export_data_to_csv(data, filename="simulation_results.csv"):
     """
     Export simulation data to CSV file.
     
+    A filename ending in .parquet writes a zstd-compressed Parquet file with
+    the same columns instead (this needs pyarrow).
+    
     Args:
-        data: Dictionary of collected data from the model
+        data: Dictionary of collected data from the model, or a SimArrays
         filename: Name of the CSV file to create
     """
-    import csv
-    
-    with open(filename, 'w', newline='') as csvfile:
-        writer = csv.writer(csvfile)
-        
-        # Write header
-        writer.writerow([
-            'Tick', 'Year', 'Total_Locals', 'Total_Migrants',
-            'Local_Vocab', 'Local_Grammar', 'Local_Phonetics', 'Local_Pronouns',
-            'Migrant_Vocab', 'Migrant_Grammar', 'Migrant_Phonetics', 'Migrant_Pronouns'
-        ])
-        
-        # Write data
-        for i in range(len(data['tick'])):
-            writer.writerow([
-                data['tick'][i],
-                data['tick'][i] / 12,
-                data['total_locals'][i],
-                data['total_migrants'][i],
-                data['mean_local_vocab'][i],
-                data['mean_local_grammar'][i],
-                data['mean_local_phonetics'][i],
-                data['mean_local_pronouns'][i],
-                data['mean_migrant_vocab'][i],
-                data['mean_migrant_grammar'][i],
-                data['mean_migrant_phonetics'][i],
-                data['mean_migrant_pronouns'][i],
-            ])
+    arr = _sim_arrays(data)
+    
+    if str(filename).endswith('.parquet'):
+        if not HAVE_PYARROW:
+            raise ImportError("Parquet export requires pyarrow (pip install pyarrow)")
+        table = pa.table({header: arr[series] for header, series, _ in _EXPORT_COLUMNS})
+        pq.write_table(table, filename, compression='zstd')
+        print(f"Data exported to {filename}")
+        return
+    
+    table = np.column_stack([arr[series] for _, series, _ in _EXPORT_COLUMNS])
+    np.savetxt(filename, table, delimiter=',', comments='',
+               header=','.join(header for header, _, _ in _EXPORT_COLUMNS),
+               fmt=[fmt for _, _, fmt in _EXPORT_COLUMNS])
     
     print(f"Data exported to {filename}")